@@ -0,0 +1,361 @@
+"""
+GotifyMsgPush 离线性能测试
+
+在本机启动一个模拟的 Gotify 服务器（可配置响应延迟、错误率、限流），以桩模块替换 MoviePilot 的 app.*，
+用合成的 NoticeMessage 突发流量驱动 GotifyMsgPush.send，统计吞吐量、入队及端到端耗时、内存增长和连接数。
+
+依赖：requests、fastapi（与 MoviePilot 运行环境一致）
+
+用法示例：
+    python benchmarks/gotifymsgpush_bench.py --messages 2000 --burst 200 --latency-ms 20
+    python benchmarks/gotifymsgpush_bench.py --error-rate 0.1 --server-rate 50 --rate-limit 40
+    python benchmarks/gotifymsgpush_bench.py --batch --json
+"""
+import argparse
+import enum
+import importlib.util
+import json
+import logging
+import random
+import re
+import socket
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+import types
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from urllib.parse import parse_qs
+
+PLUGIN_PATH = Path(__file__).resolve().parent.parent / "plugins.v2" / "gotifymsgpush" / "__init__.py"
+MESSAGE_ID = re.compile(r"bench-(\d+)")
+
+
+class FakeGotify(ThreadingHTTPServer):
+    """
+    模拟的 Gotify 服务器
+    """
+    daemon_threads = True
+
+    def __init__(self, latency: float = 0, error_rate: float = 0, rate: float = 0):
+        """
+        :param latency: 每个请求的响应延迟（秒）
+        :param error_rate: 返回 500 的概率
+        :param rate: 每秒允许的请求数，超出返回 429，0 为不限流
+        """
+        super().__init__(("127.0.0.1", 0), FakeGotifyHandler)
+        self.latency = latency
+        self.error_rate = error_rate
+        self.rate = rate
+        self.lock = threading.Lock()
+        self.connections = 0
+        self.status: Dict[int, int] = {}
+        # 消息编号 -> 首次成功接收时间
+        self.received: Dict[int, float] = {}
+        self._tokens = rate
+        self._updated = time.monotonic()
+
+    @staticmethod
+    def parse_message(body: bytes, content_type: str) -> Optional[str]:
+        """
+        与 Gotify 一致，按 Content-Type 选择解析方式，返回 message 字段
+        """
+        text = body.decode("utf-8", "ignore")
+        try:
+            if content_type.split(";")[0].strip().lower() == "application/json":
+                message = json.loads(text).get("message")
+            else:
+                message = (parse_qs(text).get("message") or [None])[0]
+        except (ValueError, AttributeError):
+            return None
+        return message if isinstance(message, str) and message else None
+
+    def handle_message(self, body: bytes, content_type: str) -> int:
+        if self.latency:
+            time.sleep(self.latency)
+        message = self.parse_message(body, content_type)
+        with self.lock:
+            # 缺少 message 字段时 Gotify 返回 400
+            code = 200 if message else 400
+            if code == 200 and self.rate:
+                now = time.monotonic()
+                self._tokens = min(self.rate, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens < 1:
+                    code = 429
+                else:
+                    self._tokens -= 1
+            if code == 200 and random.random() < self.error_rate:
+                code = 500
+            self.status[code] = self.status.get(code, 0) + 1
+            if code == 200:
+                now = time.perf_counter()
+                for msg_id in MESSAGE_ID.findall(message):
+                    self.received.setdefault(int(msg_id), now)
+        return code
+
+
+class FakeGotifyHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server: FakeGotify
+
+    def setup(self):
+        super().setup()
+        # 避免 Nagle 算法与延迟确认叠加造成的额外延迟
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        with self.server.lock:
+            self.server.connections += 1
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        code = self.server.handle_message(body, self.headers.get("Content-Type") or "")
+        payload = b'{"id": 1}' if code == 200 else b'{"error": "bench"}'
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+def install_stubs(data_path: Path):
+    """
+    以桩模块替换插件依赖的 app.*
+    """
+    import requests
+
+    def module(name: str, **attrs) -> types.ModuleType:
+        mod = types.ModuleType(name)
+        mod.__dict__.update(attrs)
+        sys.modules[name] = mod
+        return mod
+
+    class Event:
+        def __init__(self, event_type: Any = None, event_data: Optional[dict] = None):
+            self.event_type = event_type
+            self.event_data = event_data or {}
+
+    class EventManager:
+        @staticmethod
+        def register(etype):
+            return lambda func: func
+
+    class EventType(enum.Enum):
+        NoticeMessage = "noticemessage"
+        PluginAction = "plugin.action"
+
+    class NotificationType(enum.Enum):
+        Download = "资源下载"
+        Organize = "整理入库"
+        Subscribe = "订阅"
+        SiteMessage = "站点"
+        MediaServer = "媒体服务器"
+        Manual = "手动处理"
+        Plugin = "插件"
+        Other = "其它"
+
+    class PluginBase:
+        def update_config(self, config: dict, plugin_id: str = None):
+            self._bench_config = config
+
+        def get_data_path(self) -> Path:
+            return data_path
+
+    class RequestUtils:
+        """
+        与 MoviePilot 的 RequestUtils 行为一致：未指定 content_type 时使用表单 Content-Type，异常时返回 None
+        """
+
+        def __init__(self, headers: dict = None, ua: str = None, session=None, timeout: int = 20,
+                     content_type: str = None, accept_type: str = None, **kwargs):
+            self._session = session
+            self._timeout = timeout
+            if headers:
+                self._headers = headers
+            else:
+                self._headers = {
+                    "User-Agent": ua or "MoviePilot",
+                    "Content-Type": content_type or "application/x-www-form-urlencoded; charset=UTF-8",
+                    "Accept": accept_type or "application/json"
+                }
+
+        def post_res(self, url: str, data: Any = None, json: Any = None, params: Any = None,
+                     raise_exception: bool = False, **kwargs):
+            request = self._session.request if self._session else requests.request
+            try:
+                return request("post", url, data=data, json=json, params=params, headers=self._headers,
+                               timeout=self._timeout)
+            except requests.exceptions.RequestException:
+                if raise_exception:
+                    raise
+                return None
+
+    logger = logging.getLogger("gotifymsgpush_bench")
+    logger.warn = logger.warning
+
+    module("app")
+    module("app.core")
+    module("app.core.event", Event=Event, EventManager=EventManager, eventmanager=EventManager())
+    module("app.log", logger=logger)
+    module("app.plugins", _PluginBase=PluginBase)
+    module("app.schemas")
+    module("app.schemas.types", EventType=EventType, NotificationType=NotificationType)
+    module("app.utils")
+    module("app.utils.http", RequestUtils=RequestUtils)
+
+
+def load_plugin():
+    spec = importlib.util.spec_from_file_location("gotifymsgpush", PLUGIN_PATH)
+    plugin = importlib.util.module_from_spec(spec)
+    sys.modules["gotifymsgpush"] = plugin
+    spec.loader.exec_module(plugin)
+    return plugin
+
+
+def percentile(values: List[float], q: float) -> float:
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))]
+
+
+def run(args: argparse.Namespace) -> dict:
+    data_path = Path(tempfile.mkdtemp(prefix="gotifymsgpush_bench_"))
+    install_stubs(data_path)
+    plugin_module = load_plugin()
+    from app.core.event import Event
+    from app.schemas.types import NotificationType
+
+    server = FakeGotify(latency=args.latency_ms / 1000, error_rate=args.error_rate, rate=args.server_rate)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    tracemalloc.start()
+    plugin = plugin_module.GotifyMsgPush()
+    plugin.init_plugin({
+        "enabled": True,
+        "server": f"http://127.0.0.1:{server.server_port}",
+        "apikey": "bench",
+        "priority": "5",
+        "queue_size": str(args.queue_size),
+        "queue_workers": str(args.workers),
+        "pool_size": str(args.pool_size),
+        "batch_enabled": args.batch,
+        "batch_window": str(args.batch_window),
+        "retry_times": str(args.retry_times),
+        "retry_delay": "1",
+        "rate_limit": str(args.rate_limit),
+        "rate_burst": str(args.rate_burst),
+        "dedup_enabled": args.dup_ratio > 0,
+    })
+    baseline, _ = tracemalloc.get_traced_memory()
+
+    mtypes = list(NotificationType)
+    enqueue: List[float] = []
+    sent_at: Dict[int, float] = {}
+    source = 0
+    started = time.perf_counter()
+    for msg_id in range(args.messages):
+        if msg_id and msg_id % args.burst == 0 and args.burst_interval:
+            time.sleep(args.burst_interval)
+        # 按比例重复上一条消息以测试去重，重复消息与原消息的内容、类型均相同
+        if not (msg_id and random.random() < args.dup_ratio):
+            source = msg_id
+        text = f"bench-{source}"
+        event = Event(event_data={
+            "mtype": mtypes[source % len(mtypes)],
+            "title": f"benchmark {text}",
+            "text": text
+        })
+        begin = time.perf_counter()
+        plugin.send(event)
+        enqueue.append(time.perf_counter() - begin)
+        sent_at.setdefault(int(MESSAGE_ID.search(text).group(1)), begin)
+    send_finished = time.perf_counter()
+
+    # 等待投递完成
+    deadline = time.monotonic() + args.timeout
+    while time.monotonic() < deadline:
+        metrics = plugin.metrics()
+        if len(server.received) >= len(sent_at) \
+                or (not metrics["queue_depth"] and not metrics["retry_pending"]
+                    and time.perf_counter() - send_finished > args.batch_window / 1000 + 0.5):
+            break
+        time.sleep(0.05)
+    current, peak = tracemalloc.get_traced_memory()
+    metrics = plugin.metrics()
+    plugin.stop_service()
+    tracemalloc.stop()
+    server.shutdown()
+
+    delivered = {msg_id: at for msg_id, at in server.received.items() if msg_id in sent_at}
+    end_to_end = [at - sent_at[msg_id] for msg_id, at in delivered.items()]
+    elapsed = (max(delivered.values()) - started) if delivered else 0
+    return {
+        "messages": args.messages,
+        "unique": len(sent_at),
+        "delivered": len(delivered),
+        "server_requests": sum(server.status.values()),
+        "server_status": server.status,
+        "connections": server.connections,
+        "throughput_msgs_per_sec": round(len(delivered) / elapsed, 1) if elapsed else 0,
+        "enqueue_us": {
+            "p50": round(percentile(enqueue, 0.5) * 1e6, 1),
+            "p99": round(percentile(enqueue, 0.99) * 1e6, 1),
+            "max": round(max(enqueue) * 1e6, 1) if enqueue else 0
+        },
+        "end_to_end_ms": {
+            "p50": round(percentile(end_to_end, 0.5) * 1000, 1),
+            "p99": round(percentile(end_to_end, 0.99) * 1000, 1)
+        },
+        "push_latency_ms": {key: round(metrics["latency"][key] * 1000, 1) for key in ("p50", "p95", "p99")},
+        "memory_kb": {
+            "growth": round((current - baseline) / 1024, 1),
+            "peak": round(peak / 1024, 1)
+        },
+        "dropped": metrics["dropped"],
+        "deduplicated": metrics["deduplicated"],
+        "outbox": metrics["outbox"]
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="GotifyMsgPush 离线性能测试")
+    parser.add_argument("--messages", type=int, default=1000, help="发送的消息总数")
+    parser.add_argument("--burst", type=int, default=100, help="每批突发的消息数")
+    parser.add_argument("--burst-interval", type=float, default=0.1, help="两批突发之间的间隔（秒）")
+    parser.add_argument("--latency-ms", type=float, default=10, help="模拟服务器的响应延迟（毫秒）")
+    parser.add_argument("--error-rate", type=float, default=0, help="模拟服务器返回 500 的概率")
+    parser.add_argument("--server-rate", type=float, default=0, help="模拟服务器每秒允许的请求数，超出返回 429")
+    parser.add_argument("--queue-size", type=int, default=1000, help="投递队列深度")
+    parser.add_argument("--workers", type=int, default=2, help="投递线程数")
+    parser.add_argument("--pool-size", type=int, default=4, help="连接池大小")
+    parser.add_argument("--batch", action="store_true", help="开启突发消息合并")
+    parser.add_argument("--batch-window", type=int, default=500, help="合并窗口（毫秒）")
+    parser.add_argument("--retry-times", type=int, default=3, help="失败重试次数")
+    parser.add_argument("--rate-limit", type=float, default=0, help="客户端限速（条/秒）")
+    parser.add_argument("--rate-burst", type=int, default=5, help="客户端限速允许的突发条数")
+    parser.add_argument("--dup-ratio", type=float, default=0, help="重复消息比例，大于 0 时开启去重")
+    parser.add_argument("--timeout", type=float, default=60, help="等待投递完成的最长时间（秒）")
+    parser.add_argument("--seed", type=int, default=0, help="随机数种子")
+    parser.add_argument("--json", action="store_true", help="以 JSON 输出结果")
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    logging.basicConfig(level=logging.ERROR)
+    result = run(args)
+    if args.json:
+        print(json.dumps(result, ensure_ascii=False, indent=2))
+        return
+    for key, value in result.items():
+        if isinstance(value, dict):
+            value = "  ".join(f"{k}={v}" for k, v in value.items())
+        print(f"{key:<26}{value}")
+
+
+if __name__ == "__main__":
+    main()
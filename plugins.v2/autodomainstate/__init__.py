@@ -1,8 +1,21 @@
-from typing import Any, List, Dict, Tuple, Optional
+from typing import Any, List, Dict, Tuple, Optional, Callable
 from pathlib import Path
 from datetime import datetime, timedelta
-import concurrent.futures
-from collections import defaultdict
+from urllib.parse import urlparse
+import asyncio
+import heapq
+import itertools
+import random
+import re
+import socket
+import sqlite3
+import ssl
+import threading
+import time
+from bisect import bisect_left
+from collections import OrderedDict, defaultdict, deque
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from functools import partial
 import pytz
 
 from app.core.event import EventManager, eventmanager, Event
@@ -19,6 +32,681 @@ from app.db.site_oper import SiteOper
 
 from app.chain.site import SiteChain
 
+
+class ProbeEngine:
+    """
+    基于 asyncio 的站点探测引擎：全局并发上限 + 单主机并发上限，单站及整轮检测均有超时。
+    SiteChain.test 为阻塞调用，每个探测在独立的守护线程中执行，超时后直接放弃该线程，不会拖住后续调度。
+    派发前先按随机错开窗口、全局每秒检测数上限、同主机最小间隔排好各站点的启动时间，避免同一时刻集中发起请求
+    """
+    # 超时原因
+    TIMEOUT = "timeout"
+    SWEEP_TIMEOUT = "sweep timeout"
+    # 整轮检测超时时尚未开始探测（仍在等待启动时间或并发名额）的站点，并未访问站点
+    SKIPPED = "skipped"
+
+    def __init__(self, probe: Callable[[str], Any], concurrency: int = 50, per_host: int = 2,
+                 probe_timeout: float = 60, sweep_timeout: float = 600,
+                 rate: float = 0, host_spacing: float = 0, window: float = 0):
+        """
+        :param probe: 探测函数，参数为站点域名
+        :param concurrency: 全局最大并发探测数
+        :param per_host: 单个主机最大并发探测数
+        :param probe_timeout: 单站探测超时（秒）
+        :param sweep_timeout: 整轮检测超时（秒）
+        :param rate: 全局每秒最多启动的探测数，0 为不限制
+        :param host_spacing: 同一主机两次探测启动的最小间隔（秒）
+        :param window: 各站点启动时间随机错开的窗口（秒）
+        """
+        self._probe = probe
+        self._concurrency = max(1, concurrency)
+        self._per_host = max(1, per_host)
+        self._probe_timeout = probe_timeout
+        self._sweep_timeout = sweep_timeout
+        self._rate = rate
+        self._host_spacing = host_spacing
+        self._window = window
+        # 超时后被放弃、仍在运行的探测线程数
+        self.abandoned = 0
+        # 整轮检测超时时尚未开始探测的站点数
+        self.skipped = 0
+
+    @staticmethod
+    def host(domain: str) -> str:
+        """
+        站点域名对应的主机名
+        """
+        return (urlparse(domain if "://" in domain else f"//{domain}").hostname or domain).lower()
+
+    def run(self, domains: List[str], on_result: Callable[[Dict], None] = None) -> List[Dict]:
+        """
+        探测所有站点，结果形如 {"arg": domain, "result": data, "error": None}，超时的 error 为 timeout/sweep timeout，
+        整轮超时时尚未开始探测的站点 error 为 skipped
+        :param on_result: 每个站点探测完成即回调（在事件循环线程中执行），指定时不再汇总结果
+        :return: 未指定 on_result 时返回按参数顺序排列的结果列表，否则返回空列表
+        """
+        if not domains:
+            return []
+        if on_result is None:
+            results: Dict[int, Dict] = {}
+            order = {}
+            for index, domain in enumerate(domains):
+                order.setdefault(domain, []).append(index)
+
+            def on_result(item: Dict):
+                results[order[item["arg"]].pop(0)] = item
+
+            self.run(domains, on_result)
+            return [results[index] for index in range(len(domains))]
+        starts = self.plan(domains)
+        estimate = max(starts)
+        logger.info(f"本轮检测 {len(domains)} 个站点，预计派发耗时 {estimate:.1f} 秒")
+        if estimate >= self._sweep_timeout:
+            logger.warn(f"预计派发耗时超过整轮检测超时（{self._sweep_timeout}秒），超时时尚未开始检测的站点将跳过")
+        asyncio.run(self.__sweep(domains, starts, on_result))
+        return []
+
+    def plan(self, domains: List[str]) -> List[float]:
+        """
+        计算各站点相对本轮开始的启动时间（秒），按参数顺序返回。
+        先在窗口内随机错开，再按就绪先后依次分配：同一主机与上次启动间隔不小于 host_spacing，全局相邻两次启动间隔不小于 1/rate
+        """
+        interval = 1 / self._rate if self._rate else 0
+        ready = [(random.uniform(0, self._window) if self._window else 0.0, index)
+                 for index in range(len(domains))]
+        heapq.heapify(ready)
+        starts = [0.0] * len(domains)
+        host_next: Dict[str, float] = {}
+        global_next = 0.0
+        while ready:
+            at, index = heapq.heappop(ready)
+            host = self.host(domains[index])
+            if host_next.get(host, 0.0) > at:
+                # 该主机尚在间隔内，推迟后重新排队，让其他主机的站点先行
+                heapq.heappush(ready, (host_next[host], index))
+                continue
+            start = max(at, global_next)
+            starts[index] = start
+            global_next = start + interval
+            host_next[host] = start + self._host_spacing
+        return starts
+
+    def __submit(self, loop: asyncio.AbstractEventLoop, domain: str) -> asyncio.Future:
+        """
+        在独立的守护线程中执行探测，结果回传到事件循环
+        """
+        future = loop.create_future()
+
+        def deliver(result: Any = None, error: Optional[BaseException] = None):
+            if future.done():
+                return
+            if error:
+                future.set_exception(error)
+            else:
+                future.set_result(result)
+
+        def worker():
+            try:
+                result, error = self._probe(domain), None
+            except Exception as e:
+                result, error = None, e
+            try:
+                loop.call_soon_threadsafe(deliver, result, error)
+            except RuntimeError:
+                # 事件循环已结束（整轮超时后被放弃的探测）
+                pass
+
+        threading.Thread(target=worker, name=f"autodomainstate-{domain}", daemon=True).start()
+        return future
+
+    @staticmethod
+    def __emit(on_result: Callable[[Dict], None], item: Dict):
+        try:
+            on_result(item)
+        except Exception as e:
+            logger.error(f"处理站点 {item['arg']} 的检测结果出错：{e}")
+
+    async def __sweep(self, domains: List[str], starts: List[float], on_result: Callable[[Dict], None]):
+        loop = asyncio.get_running_loop()
+        limit = asyncio.Semaphore(self._concurrency)
+        host_limits: Dict[str, asyncio.Semaphore] = defaultdict(lambda: asyncio.Semaphore(self._per_host))
+        begin = loop.time()
+        # 已取得并发名额、开始访问站点的任务
+        started = set()
+
+        async def probe_one(domain: str, start: float):
+            delay = begin + start - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            async with host_limits[self.host(domain)], limit:
+                started.add(asyncio.current_task())
+                try:
+                    result = await asyncio.wait_for(self.__submit(loop, domain), timeout=self._probe_timeout)
+                    item = {"arg": domain, "result": result, "error": None}
+                except asyncio.TimeoutError:
+                    self.abandoned += 1
+                    item = {"arg": domain, "result": None, "error": self.TIMEOUT}
+                except Exception as e:
+                    item = {"arg": domain, "result": None, "error": str(e)}
+            self.__emit(on_result, item)
+
+        tasks = {asyncio.ensure_future(probe_one(domain, start)): domain for domain, start in zip(domains, starts)}
+        _, pending = await asyncio.wait(tasks, timeout=self._sweep_timeout)
+        for task in pending:
+            task.cancel()
+        if pending:
+            logger.warn(f"整轮检测超时（{self._sweep_timeout}秒），{len(pending)} 个站点未完成检测")
+        for task in pending:
+            # 尚未开始的站点并未访问，不能当作访问失败
+            if task in started:
+                self.__emit(on_result, {"arg": tasks[task], "result": None, "error": self.SWEEP_TIMEOUT})
+            else:
+                self.skipped += 1
+                self.__emit(on_result, {"arg": tasks[task], "result": None, "error": self.SKIPPED})
+
+
+class LatencyStats:
+    """
+    单站响应耗时统计：EWMA + 带衰减的固定分桶直方图（估算 p95），每次探测增量更新，无需回溯历史
+    """
+    # 直方图分桶上界（毫秒），最后一个桶为超出上界的部分
+    BOUNDS = (100, 200, 300, 500, 750, 1000, 1500, 2000, 3000, 5000, 7500, 10000, 15000, 20000, 30000, 60000)
+
+    def __init__(self, alpha: float = 0.3, decay: float = 0.95):
+        """
+        :param alpha: EWMA 平滑系数，越大越偏向最新值
+        :param decay: 每次记录前已有分桶计数的衰减系数，使旧样本逐渐淡出
+        """
+        self._alpha = alpha
+        self._decay = decay
+        self._buckets = [0.0] * (len(self.BOUNDS) + 1)
+        self.ewma: Optional[float] = None
+        self.last: Optional[float] = None
+
+    def add(self, latency: float):
+        self.last = latency
+        self.ewma = latency if self.ewma is None else self._alpha * latency + (1 - self._alpha) * self.ewma
+        self._buckets = [count * self._decay for count in self._buckets]
+        self._buckets[bisect_left(self.BOUNDS, latency)] += 1
+
+    def quantile(self, q: float = 0.95) -> Optional[float]:
+        """
+        估算分位数，返回所在分桶的上界（毫秒）
+        """
+        total = sum(self._buckets)
+        if not total:
+            return None
+        target, acc = total * q, 0.0
+        for index, count in enumerate(self._buckets):
+            acc += count
+            if acc >= target:
+                return self.BOUNDS[min(index, len(self.BOUNDS) - 1)]
+        return self.BOUNDS[-1]
+
+
+class StateWindow:
+    """
+    单站最近 N 次访问状态的环形缓冲区，写入时同步维护其中的失败次数
+    """
+    __slots__ = ("records", "failures")
+
+    def __init__(self, size: int, records: List[dict] = ()):
+        self.records = deque(maxlen=size)
+        self.failures = 0
+        for record in records:
+            self.push(record)
+
+    def push(self, record: dict):
+        if len(self.records) == self.records.maxlen and self.records[0]["lst_state"] == 1:
+            self.failures -= 1
+        self.records.append(record)
+        if record["lst_state"] == 1:
+            self.failures += 1
+
+
+class UptimeRing:
+    """
+    按小时分桶的可用率环形缓冲区（30天），各统计窗口的成功/总次数随写入及时间推移增量维护，查询为 O(1)
+    """
+    # 保留的小时数
+    SIZE = 720
+    # 统计窗口（小时）：24小时、7天、30天
+    WINDOWS = (24, 168, 720)
+
+    def __init__(self):
+        self._ok = [0] * self.SIZE
+        self._total = [0] * self.SIZE
+        # 最新的小时序号
+        self._hour: Optional[int] = None
+        # 窗口 -> [成功次数, 总次数]
+        self._sums = {window: [0, 0] for window in self.WINDOWS}
+
+    def advance(self, hour: int):
+        """
+        时间推进到指定小时，移出各窗口的过期分桶
+        """
+        if self._hour is None or hour >= self._hour + self.SIZE:
+            self._ok = [0] * self.SIZE
+            self._total = [0] * self.SIZE
+            self._sums = {window: [0, 0] for window in self.WINDOWS}
+            self._hour = hour
+            return
+        for current in range(self._hour + 1, hour + 1):
+            for window, sums in self._sums.items():
+                index = (current - window) % self.SIZE
+                sums[0] -= self._ok[index]
+                sums[1] -= self._total[index]
+            index = current % self.SIZE
+            self._ok[index] = self._total[index] = 0
+        self._hour = max(self._hour, hour)
+
+    def add(self, hour: int, ok: int, total: int = 1):
+        """
+        计入指定小时的检测结果
+        """
+        self.advance(hour)
+        age = self._hour - hour
+        if age >= self.SIZE:
+            return
+        index = hour % self.SIZE
+        self._ok[index] += ok
+        self._total[index] += total
+        for window, sums in self._sums.items():
+            if age < window:
+                sums[0] += ok
+                sums[1] += total
+
+    def uptime(self, window: int) -> Optional[float]:
+        """
+        窗口内的可用率（0-100），窗口内无检测返回 None
+        """
+        ok, total = self._sums[window]
+        return ok * 100 / total if total else None
+
+
+class SiteSummary:
+    """
+    单站详情页聚合数据：当前状态、最后变化时间、按小时的可用率及近期检测走势，每次检测增量更新
+    """
+    # 走势图保留的检测次数
+    SPARK_SIZE = 30
+    SPARK_BARS = "▁▂▃▄▅▆▇█"
+
+    def __init__(self):
+        self.state: Optional[int] = None
+        self.tier: Optional[str] = None
+        self.message = ""
+        self.last_probe: Optional[int] = None
+        self.last_change: Optional[int] = None
+        self.uptime = UptimeRing()
+        # 近期检测 (状态, 耗时)
+        self.recent = deque(maxlen=self.SPARK_SIZE)
+
+    def add(self, record: dict, ts: int):
+        state = record.get("lst_state")
+        if self.state is None or state != self.state:
+            self.last_change = ts
+        self.state = state
+        self.tier = record.get("tier")
+        self.message = record.get("lst_test_message") or ""
+        self.last_probe = ts
+        self.uptime.add(ts // 3600, 1 if state == 0 else 0)
+        self.recent.append((state, record.get("latency")))
+
+    def sparkline(self) -> str:
+        """
+        近期检测走势：失败为 ×，成功按耗时高低显示
+        """
+        latencies = [latency for state, latency in self.recent if state == 0 and latency is not None]
+        highest = max(latencies) if latencies else 0
+        bars = []
+        for state, latency in self.recent:
+            if state != 0:
+                bars.append("×")
+            elif latency is None or not highest:
+                bars.append(self.SPARK_BARS[0])
+            else:
+                bars.append(self.SPARK_BARS[min(len(self.SPARK_BARS) - 1,
+                                                round(latency / highest * (len(self.SPARK_BARS) - 1)))])
+        return "".join(bars)
+
+
+class ProbeScheduler:
+    """
+    自适应的单站检测调度：小顶堆维护各站点下次检测时间。
+    失败或响应缓慢的站点从最小间隔开始按倍数退避复查，稳定的站点逐步拉长间隔直至上限，新加入的站点在一个基础周期内均匀错开
+    """
+
+    def __init__(self, interval: float, min_interval: float, max_interval: float, factor: float = 2.0):
+        """
+        :param interval: 基础检测间隔（秒）
+        :param min_interval: 异常站点的最小复查间隔（秒）
+        :param max_interval: 稳定站点的最大检测间隔（秒）
+        :param factor: 间隔退避/拉长倍数
+        """
+        self._base = interval
+        self._min = min(min_interval, interval)
+        self._max = max(max_interval, interval)
+        self._factor = factor
+        self._heap: List[Tuple[float, int, str]] = []
+        self._seq = itertools.count()
+        # 站点 -> 下次检测时间，None 表示已出队、检测中
+        self._due: Dict[str, Optional[float]] = {}
+        self._interval: Dict[str, float] = {}
+        self._unhealthy = set()
+
+    def __len__(self):
+        return len(self._due)
+
+    def __push(self, domain: str, due: float):
+        self._due[domain] = due
+        heapq.heappush(self._heap, (due, next(self._seq), domain))
+
+    def sync(self, domains: List[str], unhealthy: set = frozenset(), now: float = None):
+        """
+        同步需要检测的站点：移除已取消的站点，新站点在基础周期内均匀错开，已知异常的站点排在最前
+        """
+        now = time.time() if now is None else now
+        wanted = set(domains)
+        for domain in [domain for domain in self._due if domain not in wanted]:
+            del self._due[domain]
+            self._interval.pop(domain, None)
+            self._unhealthy.discard(domain)
+        new = sorted((domain for domain in dict.fromkeys(domains) if domain not in self._due),
+                     key=lambda domain: domain not in unhealthy)
+        if not new:
+            return
+        step = self._base / len(new)
+        for index, domain in enumerate(new):
+            self._interval[domain] = self._base
+            self.__push(domain, now + index * step)
+
+    def pop_due(self, now: float = None) -> List[str]:
+        """
+        取出已到检测时间的站点
+        """
+        now = time.time() if now is None else now
+        due = []
+        while self._heap and self._heap[0][0] <= now:
+            ts, _, domain = heapq.heappop(self._heap)
+            # 堆中过期的条目（站点已移除或已被重新安排）直接丢弃
+            if self._due.get(domain) == ts:
+                self._due[domain] = None
+                due.append(domain)
+        return due
+
+    def reschedule(self, domain: str, healthy: bool, now: float = None):
+        """
+        根据本次检测结果安排下次检测时间
+        """
+        if domain not in self._due:
+            return
+        interval = self._interval.get(domain, self._base)
+        if healthy:
+            interval = self._base if domain in self._unhealthy else min(self._max, interval * self._factor)
+            self._unhealthy.discard(domain)
+        else:
+            interval = min(self._base, interval * self._factor) if domain in self._unhealthy else self._min
+            self._unhealthy.add(domain)
+        self._interval[domain] = interval
+        self.__push(domain, (time.time() if now is None else now) + interval)
+
+    def release(self, domains: List[str], now: float = None):
+        """
+        检测中但未得到结果的站点，按原间隔重新排队
+        """
+        for domain in domains:
+            if domain in self._due and self._due[domain] is None:
+                self.__push(domain, (time.time() if now is None else now) + self._interval.get(domain, self._base))
+
+
+class ProbeCache:
+    """
+    最近一次检测结果缓存（TTL + LRU）及单飞：同一站点同一时刻只有一个检测在进行，其余调用方等待并共享其结果
+    """
+
+    def __init__(self, ttl: float = 60, capacity: int = 4096, join_timeout: Optional[float] = None):
+        """
+        :param ttl: 结果有效期（秒），0 为不缓存、仅合并同时进行的检测
+        :param capacity: 最多缓存的站点数
+        :param join_timeout: 等待进行中的检测的最长时间（秒），None 为一直等待
+        """
+        self._ttl = ttl
+        self._capacity = capacity
+        self._join_timeout = join_timeout
+        self._lock = threading.Lock()
+        # 站点 -> (过期时间, 结果)
+        self._entries: OrderedDict = OrderedDict()
+        # 站点 -> 进行中的检测
+        self._flights: Dict[str, Future] = {}
+        self.hits = 0
+        self.joins = 0
+        self.misses = 0
+
+    def peek(self, key: str) -> Any:
+        """
+        读取有效期内的结果，不触发检测
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry[1] if entry and entry[0] > time.monotonic() else None
+
+    def get(self, key: str, loader: Callable[[str], Any], fresh: bool = False) -> Tuple[Any, bool]:
+        """
+        读取结果，无有效结果时调用 loader 检测；已有同一站点的检测在进行时等待其结果
+        :param fresh: 忽略缓存的结果，但仍合并进行中的检测
+        :return: (结果, 是否为共享的结果)
+        """
+        with self._lock:
+            entry = None if fresh else self._entries.get(key)
+            if entry and entry[0] > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1], True
+            flight = self._flights.get(key)
+            owner = flight is None
+            if owner:
+                flight = self._flights[key] = Future()
+                self.misses += 1
+            else:
+                self.joins += 1
+        if not owner:
+            # 进行中的检测可能卡死，限时等待，避免每次调用都留下一个阻塞的线程
+            try:
+                return flight.result(timeout=self._join_timeout), True
+            except FutureTimeoutError:
+                raise TimeoutError(f"等待进行中的检测超时（{self._join_timeout}秒）")
+        try:
+            result = loader(key)
+        except BaseException as e:
+            with self._lock:
+                self._flights.pop(key, None)
+            flight.set_exception(e)
+            raise
+        with self._lock:
+            self._flights.pop(key, None)
+            if self._ttl > 0:
+                self._entries[key] = (time.monotonic() + self._ttl, result)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self._capacity:
+                    self._entries.popitem(last=False)
+        flight.set_result(result)
+        return result, False
+
+
+class SiteCatalogue:
+    """
+    站点目录缓存：启用站点 + 自定义站点，按站点ID与域名建立索引。
+    站点删除/更新事件及插件配置变更时失效，另有过期时间兜底（自定义站点插件的配置变更没有事件通知）
+    """
+
+    def __init__(self, loader: Callable[[], List[dict]], ttl: float = 600):
+        """
+        :param loader: 加载站点列表，元素为 {"domain", "id", "name"}
+        :param ttl: 缓存过期时间（秒）
+        """
+        self._loader = loader
+        self._ttl = ttl
+        self._lock = threading.Lock()
+        self._loaded_at = 0.0
+        self._sites: List[dict] = []
+        self._by_id: Dict[Any, dict] = {}
+        self._by_domain: Dict[str, dict] = {}
+
+    def invalidate(self):
+        self._loaded_at = 0.0
+
+    def __ensure(self):
+        if self._loaded_at and time.monotonic() - self._loaded_at < self._ttl:
+            return
+        with self._lock:
+            if self._loaded_at and time.monotonic() - self._loaded_at < self._ttl:
+                return
+            sites = self._loader()
+            by_domain = {}
+            for site in sites:
+                by_domain.setdefault(site["domain"], site)
+            self._sites, self._by_id, self._by_domain = sites, {site["id"]: site for site in sites}, by_domain
+            self._loaded_at = time.monotonic()
+
+    @property
+    def sites(self) -> List[dict]:
+        self.__ensure()
+        return self._sites
+
+    def get(self, site_id: Any) -> Optional[dict]:
+        self.__ensure()
+        return self._by_id.get(site_id)
+
+    def by_domain(self, domain: str) -> Optional[dict]:
+        self.__ensure()
+        return self._by_domain.get(domain)
+
+    def name(self, domain: str) -> str:
+        site = self.by_domain(domain)
+        return site["name"] if site else domain
+
+    def resolve(self, key: str) -> Optional[dict]:
+        """
+        按域名、网址或站点名称查找站点
+        """
+        self.__ensure()
+        key = str(key).strip()
+        site = self._by_domain.get(key) or self._by_domain.get(ProbeEngine.host(key))
+        if site:
+            return site
+        return next((site for site in self._sites if site["name"] == key or str(site["id"]) == key), None)
+
+    def domains(self, site_ids: List[Any]) -> List[str]:
+        """
+        站点ID对应的域名，忽略不存在的站点及重复域名
+        """
+        self.__ensure()
+        return list(dict.fromkeys(self._by_id[site_id]["domain"] for site_id in site_ids if site_id in self._by_id))
+
+
+class ProbeStore:
+    """
+    站点访问状态历史：插件数据目录下的 SQLite 时序表，按轮批量追加写入，按保留天数清理
+    """
+    # 清理过期记录的最小间隔（秒）
+    PURGE_INTERVAL = 3600
+
+    def __init__(self, path: Path, retention_days: int = 30):
+        """
+        :param path: 数据库文件路径
+        :param retention_days: 记录保留天数
+        """
+        self._path = path
+        self._retention = retention_days * 86400
+        self._lock = threading.Lock()
+        self._last_purge = 0.0
+        with self.__connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("CREATE TABLE IF NOT EXISTS probes ("
+                         "domain TEXT NOT NULL, ts INTEGER NOT NULL, state INTEGER NOT NULL, "
+                         "latency REAL, message TEXT, connect REAL, status INTEGER, tier TEXT)")
+            # 旧版本的表补充新增列
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(probes)")}
+            for column, column_type in (("connect", "REAL"), ("status", "INTEGER"), ("tier", "TEXT")):
+                if column not in columns:
+                    conn.execute(f"ALTER TABLE probes ADD COLUMN {column} {column_type}")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_probes_domain_ts ON probes (domain, ts)")
+            # 按时间清理过期记录、按时间范围聚合时使用，避免全表扫描
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_probes_ts ON probes (ts)")
+
+    def __connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self._path, timeout=30)
+
+    @staticmethod
+    def to_ts(lst_mod_date: str) -> int:
+        try:
+            return int(datetime.strptime(lst_mod_date, "%Y-%m-%d %H:%M:%S").timestamp())
+        except (TypeError, ValueError):
+            return int(time.time())
+
+    def append(self, records: List[dict]):
+        """
+        批量追加访问状态记录
+        """
+        if not records:
+            return
+        rows = [(record.get("domain"), self.to_ts(record.get("lst_mod_date")), record.get("lst_state"),
+                 record.get("latency"), record.get("lst_test_message"), record.get("connect"), record.get("status"),
+                 record.get("tier"))
+                for record in records]
+        with self._lock:
+            with self.__connect() as conn:
+                conn.executemany("INSERT INTO probes (domain, ts, state, latency, message, connect, status, tier) "
+                                 "VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows)
+                now = time.time()
+                if now - self._last_purge >= self.PURGE_INTERVAL:
+                    conn.execute("DELETE FROM probes WHERE ts < ?", (int(now - self._retention),))
+                    self._last_purge = now
+
+    def recent(self, limit: int) -> Dict[str, List[dict]]:
+        """
+        每个站点最近的 limit 条记录，按时间升序
+        """
+        result: Dict[str, List[dict]] = defaultdict(list)
+        with self.__connect() as conn:
+            rows = conn.execute("SELECT domain, ts, state, latency, message, connect, status, tier FROM ("
+                                "SELECT *, ROW_NUMBER() OVER (PARTITION BY domain ORDER BY ts DESC, rowid DESC) AS rn "
+                                "FROM probes) WHERE rn <= ? ORDER BY domain, ts, rn DESC", (limit,)).fetchall()
+        for domain, ts, state, latency, message, connect, status, tier in rows:
+            result[domain].append({
+                "domain": domain,
+                "lst_state": state,
+                "lst_mod_date": datetime.fromtimestamp(ts).strftime("%Y-%m-%d %H:%M:%S"),
+                "lst_test_message": message,
+                "latency": latency,
+                "connect": connect,
+                "status": status,
+                "tier": tier
+            })
+        return dict(result)
+
+    def aggregates(self, since: int) -> Tuple[List[tuple], Dict[str, int]]:
+        """
+        详情页聚合数据的初始值
+        :param since: 统计起始时间戳
+        :return: (按站点、小时汇总的 [(domain, hour, 成功次数, 总次数)], 各站点最后一次状态变化的时间戳)
+        """
+        with self.__connect() as conn:
+            hourly = conn.execute("SELECT domain, ts / 3600 AS hour, SUM(state = 0), COUNT(*) FROM probes "
+                                  "WHERE ts >= ? GROUP BY domain, hour ORDER BY hour", (since,)).fetchall()
+            changes = conn.execute("SELECT domain, MAX(ts) FROM ("
+                                   "SELECT domain, ts, state, LAG(state) OVER "
+                                   "(PARTITION BY domain ORDER BY ts, rowid) AS prev FROM probes) "
+                                   "WHERE prev IS NULL OR prev != state GROUP BY domain").fetchall()
+        return hourly, dict(changes)
+
+    def clear(self):
+        with self._lock:
+            with self.__connect() as conn:
+                conn.execute("DELETE FROM probes")
+
+
 class AutoDomainState(_PluginBase):
     # 插件名称
     plugin_name = "监测站点访问状态提醒"
@@ -27,7 +715,7 @@ class AutoDomainState(_PluginBase):
     # 插件图标
     plugin_icon = "Chatgpt_A.png"
     # 插件版本
-    plugin_version = "1.6"
+    plugin_version = "2.9"
     # 插件作者
     plugin_author = "MidnightShake"
     # 作者主页
@@ -50,11 +738,68 @@ class AutoDomainState(_PluginBase):
     _clean = False
     _cron = ''
     _failed_threshold = ''
+    _probe_concurrency = 50
+    _probe_per_host = 2
+    _probe_timeout = 60
+    _sweep_timeout = 600
+    _probe_rate = 10
+    _host_spacing = 2
+    _dispatch_window = 10
+    _cache_ttl = 60
+    _tiered = False
+    _full_interval = 360
+    _retention_days = 30
+    _latency_threshold = 0
+    _adaptive = False
+    _probe_interval = 60
+    _min_interval = 5
+    _max_interval = 360
     _sign_sites = []
-    _domain_state_list = {}
-    _check_state_failures_domain = []
+    # 各站点最近的访问状态记录（内存），完整历史保存在 ProbeStore 中
+    _domain_state_list: Dict[str, StateWindow] = {}
+    # 失败次数达到阀值的站点域名
+    _failing_domains = set()
+    # 响应缓慢的站点域名
+    _degraded_domains = set()
+    # 本轮有新记录、待重新评估的站点域名
+    _changed_domains = set()
+    _new_records = []
+    # 访问状态历史
+    _store: Optional[ProbeStore] = None
+    # 各站点响应耗时统计
+    _latency_stats: Dict[str, LatencyStats] = {}
+    # 各站点详情页聚合数据
+    _summaries: Dict[str, SiteSummary] = {}
     # 定时器
     _scheduler: Optional[BackgroundScheduler] = None
+    # 自适应检测调度
+    _probe_scheduler: Optional[ProbeScheduler] = None
+    # 站点目录
+    _catalogue: Optional[SiteCatalogue] = None
+    # 检测结果缓存
+    _probe_cache: Optional[ProbeCache] = None
+    # 各站点最近一次完整检测的时间
+    _last_full: Dict[str, float] = {}
+    # 检测结果处理锁，整轮检测、自适应检测与单站复查可能同时进行
+    _state_lock: Optional[threading.Lock] = None
+    # 正在复查中的站点域名
+    _reprobing = set()
+    _reprobe_lock: Optional[threading.Lock] = None
+    # 检测中累计多少条新记录写入一次历史库
+    _FLUSH_SIZE = 100
+    # 单站复查命令的动作标识
+    _REPROBE_ACTION = "autodomainstate_reprobe"
+    # 自适应检测时检查到期站点的间隔（秒）
+    _TICK_SECONDS = 30
+    # 检测层级：轻量检测（DNS + TCP/TLS 建连）、完整检测（SiteChain.test）
+    _TIER_LIGHT = "light"
+    _TIER_FULL = "full"
+    # 轻量检测只关心能否完成握手，不校验证书
+    _SSL_CONTEXT = ssl.create_default_context()
+    _SSL_CONTEXT.check_hostname = False
+    _SSL_CONTEXT.verify_mode = ssl.CERT_NONE
+    # 站点测试返回信息中的 HTTP 状态码
+    _STATUS_PATTERN = re.compile(r"状态码：(\d{3})")
 
     def init_plugin(self, config: dict = None):
         self.sites = SitesHelper()
@@ -63,6 +808,10 @@ class AutoDomainState(_PluginBase):
         self.db_oper = DbOper()
         self._scheduler = BackgroundScheduler(timezone=settings.TZ)
         self.sitechain = SiteChain()
+        self._catalogue = SiteCatalogue(loader=self.__site_options)
+        self._state_lock = threading.Lock()
+        self._reprobe_lock = threading.Lock()
+        self._reprobing = set()
 
         if config:
             self._enabled = config.get("enabled")
@@ -73,14 +822,62 @@ class AutoDomainState(_PluginBase):
             self._cron = config.get("cron")
             self._failed_threshold = config.get("failed_threshold")
             self._sign_sites = config.get("sign_sites")
-            self._domain_state_list = config.get("domain_state_list") or {}
+            self._probe_concurrency = self.__to_int(config.get("probe_concurrency"), 50)
+            self._probe_per_host = self.__to_int(config.get("probe_per_host"), 2)
+            self._probe_timeout = self.__to_int(config.get("probe_timeout"), 60)
+            self._sweep_timeout = self.__to_int(config.get("sweep_timeout"), 600)
+            self._probe_rate = self.__to_int(config.get("probe_rate"), 10, minimum=0)
+            self._host_spacing = self.__to_int(config.get("host_spacing"), 2, minimum=0)
+            self._dispatch_window = self.__to_int(config.get("dispatch_window"), 10, minimum=0)
+            self._cache_ttl = self.__to_int(config.get("cache_ttl"), 60, minimum=0)
+            self._probe_cache = ProbeCache(ttl=self._cache_ttl, join_timeout=self._probe_timeout)
+            self._tiered = config.get("tiered")
+            self._full_interval = self.__to_int(config.get("full_interval"), 360)
+            self._retention_days = self.__to_int(config.get("retention_days"), 30)
+            self._latency_threshold = self.__to_int(config.get("latency_threshold"), 0, minimum=0)
+            self._adaptive = config.get("adaptive")
+            self._probe_interval = self.__to_int(config.get("probe_interval"), 60)
+            self._min_interval = self.__to_int(config.get("min_interval"), 5)
+            self._max_interval = self.__to_int(config.get("max_interval"), 360)
+
+            self._store = ProbeStore(path=self.get_data_path() / "probe_history.db",
+                                     retention_days=self._retention_days)
+            # 旧版本暂存在配置中的记录迁移到历史库
+            legacy_state_list = config.get("domain_state_list")
+            if legacy_state_list:
+                self._store.append([record for records in legacy_state_list.values() for record in records])
+                logger.info(f"已将配置中暂存的 {len(legacy_state_list)} 个站点的访问状态记录迁移到历史库")
+                self.__update_config()
+            recent_records = self._store.recent(max(self.__max_records(), SiteSummary.SPARK_SIZE))
+            self._domain_state_list = {domain: StateWindow(self.__max_records(), records)
+                                       for domain, records in recent_records.items()}
+            self.__load_summaries(recent_records)
+            self._new_records = []
+            self._latency_stats = {}
+            self._last_full = {}
+            for domain, window in self._domain_state_list.items():
+                for record in window.records:
+                    self.__update_latency_stats(record)
+                    if record.get("tier") != self._TIER_LIGHT:
+                        self._last_full[domain] = ProbeStore.to_ts(record.get("lst_mod_date"))
+            self._failing_domains = set()
+            self._degraded_domains = set()
+            self._changed_domains = set(self._domain_state_list)
+            self.__evaluate_failures()
 
             # 过滤掉已删除的站点，排除未启用站点
-            all_sites = [site.id for site in self.siteoper.list_active()] + [site.get("id") for site in self.__custom_sites()]
-            self._sign_sites = [site_id for site_id in all_sites if site_id in self._sign_sites]
+            sign_sites = set(self._sign_sites or [])
+            self._sign_sites = [site["id"] for site in self._catalogue.sites if site["id"] in sign_sites]
 
             if self._clean:
                 self._domain_state_list = {}
+                self._failing_domains = set()
+                self._degraded_domains = set()
+                self._changed_domains = set()
+                self._latency_stats = {}
+                self._last_full = {}
+                self._summaries = {}
+                self._store.clear()
                 self._clean = False
                 self.__update_config()
                 log_path = settings.LOG_PATH / Path("plugins") / f"autodomainstate.log"
@@ -91,6 +888,7 @@ class AutoDomainState(_PluginBase):
                     file.writelines(log_data)
                 logger.info('插件自身日志、暂存记录 已处理。')
 
+            self._probe_scheduler = None
             if self._enabled or self._onlyonce:
                 if self._onlyonce:
                     logger.info(f"监测站点访问状态提醒 服务启动，立即运行一次")
@@ -99,8 +897,15 @@ class AutoDomainState(_PluginBase):
                                             name="立即运行一次 监测站点访问状态提醒")
                     self._onlyonce = False
                     self.__update_config()
+                # 自适应检测
+                if self._enabled and self._adaptive:
+                    self._probe_scheduler = ProbeScheduler(interval=self._probe_interval * 60,
+                                                           min_interval=self._min_interval * 60,
+                                                           max_interval=self._max_interval * 60)
+                    self._scheduler.add_job(func=self.__tick, trigger='interval', seconds=self._TICK_SECONDS,
+                                            name="自适应检测 监测站点访问状态提醒")
                 # 周期运行
-                if self._enabled:
+                elif self._enabled:
                     try:
                         cron = '0 0 * * *'
                         if self._cron:
@@ -124,6 +929,16 @@ class AutoDomainState(_PluginBase):
     def get_state(self) -> bool:
         return self._enabled
 
+    @staticmethod
+    def __to_int(value: Any, default: int, minimum: int = 1) -> int:
+        """
+        将表单中的文本配置转换为整数
+        """
+        try:
+            return max(minimum, int(value))
+        except (TypeError, ValueError):
+            return default
+
     def __update_config(self):
         self.update_config({
             "enabled": self._enabled,
@@ -133,99 +948,291 @@ class AutoDomainState(_PluginBase):
             "clean": self._clean,
             "cron": self._cron,
             "sign_sites": self._sign_sites,
-            "domain_state_list": self._domain_state_list,
-            "failed_threshold": self._failed_threshold
+            "failed_threshold": self._failed_threshold,
+            "retention_days": self._retention_days,
+            "latency_threshold": self._latency_threshold,
+            "adaptive": self._adaptive,
+            "probe_interval": self._probe_interval,
+            "min_interval": self._min_interval,
+            "max_interval": self._max_interval,
+            "probe_concurrency": self._probe_concurrency,
+            "probe_per_host": self._probe_per_host,
+            "probe_timeout": self._probe_timeout,
+            "sweep_timeout": self._sweep_timeout,
+            "probe_rate": self._probe_rate,
+            "host_spacing": self._host_spacing,
+            "dispatch_window": self._dispatch_window,
+            "cache_ttl": self._cache_ttl,
+            "tiered": self._tiered,
+            "full_interval": self._full_interval
         })
 
-    def __runOnlyonce(self, event: Event = None):
+    def __site_options(self) -> List[dict]:
         """
-        构建 站点访问状态 的结果数据
+        所有启用站点及自定义站点
         """
         customSites = self.__custom_sites()
-        site_all_options = ([{"domain": site.domain, "id": site.id, "name":site.name}
-                         for site in self.siteoper.list_active()]
-                        + [{"domain": site.get("domain"), "id": site.get("id"), "name": site.get("name")}
-                           for site in customSites])
-        _sign_sites_domain = []
+        return ([{"domain": site.domain, "id": site.id, "name":site.name}
+                 for site in self.siteoper.list_active()]
+                + [{"domain": site.get("domain"), "id": site.get("id"), "name": site.get("name")}
+                   for site in customSites])
+
+    def __tick(self):
+        """
+        自适应检测：同步选定站点，检测已到期的站点
+        """
+        if self._probe_scheduler is None:
+            return
+        self._probe_scheduler.sync(self._catalogue.domains(self._sign_sites), unhealthy=self._failing_domains)
+        due = self._probe_scheduler.pop_due()
+        if not due:
+            return
+        logger.info(f"自适应检测：本次检测 {len(due)} 个到期站点，共调度 {len(self._probe_scheduler)} 个站点")
+        try:
+            # 自适应检测频繁复查异常站点，只在状态变化时提醒（由 __on_result 发出），不再汇总提醒
+            self.__runOnlyonce(domains=set(due), summarize=False)
+        finally:
+            self._probe_scheduler.release(due)
+
+    def __runOnlyonce(self, event: Event = None, domains: set = None, targeted: bool = False,
+                      summarize: bool = True):
+        """
+        构建 站点访问状态 的结果数据
+        :param domains: 仅检测指定的站点域名，默认检测全部选定站点
+        :param summarize: 检测结束后是否汇总提醒仍处于异常的站点
+        :param targeted: 单站复查，可检测任意启用站点，且不做随机错开、立即派发
+        """
         # 定义任务参数列表
-        task_args = []
-        for options in site_all_options:
-            if options["id"] in self._sign_sites:
-                task_args.append(options["domain"])
+        if targeted:
+            task_args = list(domains)
+        else:
+            task_args = [domain for domain in self._catalogue.domains(self._sign_sites)
+                         if domains is None or domain in domains]
         # 执行任务并获取结果集合
-        all_results = self._run_concurrent_tasks(
-            task_func=self.__GetStateAndSendMassage,
-            task_args_list=task_args,
-            max_workers=20,
-            timeout=20
-        )
-        # 解析结果
-        for item in all_results:
-            if item["error"]:
-                logger.info(f"Failed: {item['arg']} -> {item['error']}")
+        engine = ProbeEngine(probe=partial(self.__probe, fresh=True) if targeted else self.__probe,
+                             concurrency=self._probe_concurrency,
+                             per_host=self._probe_per_host,
+                             probe_timeout=self._probe_timeout,
+                             sweep_timeout=self._sweep_timeout,
+                             rate=self._probe_rate,
+                             host_spacing=self._host_spacing,
+                             window=0 if targeted else self._dispatch_window)
+        # 本轮已单独发出提醒的站点
+        alerted = set()
+        engine.run(task_args, on_result=lambda item: self.__on_result(item, alerted))
+        if engine.abandoned:
+            logger.warn(f"本轮有 {engine.abandoned} 个站点检测超时，已放弃等待")
+        if engine.skipped:
+            logger.warn(f"本轮有 {engine.skipped} 个站点未能在整轮检测超时前开始检测，已跳过")
+        with self._state_lock:
+            self.__flush_records()
+            if summarize:
+                self.__summarize(event, task_args, alerted)
+
+    def __on_result(self, item: Dict, alerted: set):
+        """
+        处理单个站点的检测结果：记录、评估，状态转为异常时立即提醒
+        """
+        domain = item["arg"]
+        if item["error"] == ProbeEngine.SKIPPED:
+            # 未访问站点，不记录、不评估；自适应检测由 release 按原间隔重新排队
+            logger.info(f"当前测试站点 {domain} 未在整轮检测超时前开始检测，已跳过")
+            return
+        with self._state_lock:
+            if item["error"] in (ProbeEngine.TIMEOUT, ProbeEngine.SWEEP_TIMEOUT):
+                # 超时记为访问失败
+                logger.info(f"当前测试站点连接性结果 {domain}：1 , 检测超时({item['error']})")
+                self.__update_domain_state_list(domain=domain,
+                                                site_state_data=self.__build_state(domain, 1, f"检测超时({item['error']})"))
+            elif item["error"]:
+                logger.info(f"Failed: {domain} -> {item['error']}")
             else:
-                # logger.info(f"Success: {item['arg']} -> {item['result']}")
-                domian_state, lst_state = item['result']
-                if domian_state:
-                    self.__update_domain_state_list(domain=item['arg'], site_state_data=domian_state)
-        self.__update_config()
-        # 检查站点失败总次数
-        _check_state_failures_domain = []
-        _sign_sites_domain = task_args
-        for domain in self._domain_state_list.keys():
-            _check_state_failures_domain = self.__check_state_failures(domain, _check_state_failures_domain, _sign_sites_domain)
-        # logger.info(f"记录中的失败状态次数达到阀值站点域名列表：{_check_state_failures_domain}")
+                # logger.info(f"Success: {domain} -> {item['result']}")
+                (domian_state, lst_state), shared = item['result']
+                # 共享的结果可能已由发起检测的一方记录，同一结果只记录一次
+                if domian_state and not domian_state.get("recorded"):
+                    domian_state["recorded"] = True
+                    self.__update_domain_state_list(domain=domain, site_state_data=domian_state)
+            if len(self._new_records) >= self._FLUSH_SIZE:
+                self.__flush_records()
+            # 仅重新评估有新记录的站点
+            newly_failing = self.__evaluate_failures()
+            degraded = bool(self._latency_threshold) and domain not in self._failing_domains \
+                and self.__is_degraded(domain)
+            newly_degraded = degraded and domain not in self._degraded_domains
+            if degraded:
+                self._degraded_domains.add(domain)
+            else:
+                self._degraded_domains.discard(domain)
+            # 按本次结果安排该站点下次检测时间
+            if self._probe_scheduler is not None:
+                window = self._domain_state_list.get(domain)
+                healthy = bool(window and window.records and window.records[-1]["lst_state"] == 0 and not degraded)
+                self._probe_scheduler.reschedule(domain, healthy)
+        if domain in newly_failing:
+            alerted.add(domain)
+            self.__notify(f"站点 {self._catalogue.name(domain)}（{domain}）近期连续访问失败次数到达阀值")
+        elif newly_degraded:
+            alerted.add(domain)
+            stats = self._latency_stats[domain]
+            self.__notify(f"站点 {self._catalogue.name(domain)}（{domain}）响应耗时超过 {self._latency_threshold}ms："
+                          f"平均{stats.ewma:.0f}ms p95≤{stats.quantile()}ms")
+
+    def __flush_records(self):
+        """
+        新增记录批量写入历史库
+        """
+        if self._store and self._new_records:
+            self._store.append(self._new_records)
+        self._new_records = []
+
+    def __notify(self, text: str):
+        logger.info(text)
+        if self._notify:
+            self.post_message(mtype=NotificationType.Plugin, title=f"【监测站点访问状态插件提醒】", text=text)
+        if self._notify_sys:
+            self.systemmessage.put(text)
+
+    def __summarize(self, event: Optional[Event], task_args: List[str], alerted: set):
+        """
+        本轮检测结束后，汇总提醒仍处于异常、且本轮未单独提醒过的站点
+        """
+        _check_state_failures_domain = [domain for domain in task_args
+                                        if domain in self._failing_domains and domain not in alerted]
+        _check_state_failures_name = [self._catalogue.name(domain) for domain in _check_state_failures_domain]
         if len(_check_state_failures_domain) > 0:
-            _check_state_failures_name = []
-            for options in site_all_options:
-                if options["domain"] in _check_state_failures_domain:
-                    _check_state_failures_name.append(options["name"])
-            logger.info(f"近期连续访问失败次数到达阀值的 站点：{_check_state_failures_name} 对应域名：{_check_state_failures_domain}")
-            if self._notify:
-                self.post_message(
-                    mtype=NotificationType.Plugin,
-                    title=f"【监测站点访问状态插件提醒】",
-                    text=f"近期连续访问失败次数到达阀值的 站点：{_check_state_failures_name} 对应域名：{_check_state_failures_domain}"
-                    )
-            if self._notify_sys:
-                self.systemmessage.put(f"近期连续访问失败次数到达阀值的 站点：{_check_state_failures_name} 对应域名：{_check_state_failures_domain}")
+            self.__notify(f"近期连续访问失败次数到达阀值的 站点：{_check_state_failures_name} 对应域名：{_check_state_failures_domain}")
             if event:
                 self.post_message(
                     channel=event.event_data.get("channel"),
                     title=f"【监测站点访问状态插件提醒】",
                     userid=event.event_data.get("userid")
                     )
-        else:
+        elif not any(domain in self._failing_domains for domain in task_args):
             logger.info(f"未检测到 近期连续访问失败次数到达阀值的站点")
+        # 检查站点响应耗时
+        if self._latency_threshold:
+            _degraded = [(self._catalogue.name(domain), domain, self._latency_stats[domain])
+                         for domain in task_args
+                         if domain in self._degraded_domains and domain not in alerted]
+            if _degraded:
+                self.__notify(f"近期响应耗时超过 {self._latency_threshold}ms 的 站点："
+                              + "，".join(f"{name}({domain} 平均{stats.ewma:.0f}ms p95≤{stats.quantile()}ms)"
+                                         for name, domain, stats in _degraded))
 
     def __update_domain_state_list(self, domain, site_state_data):
         """
         保留最新的指定次数的记录
         """
         if domain not in self._domain_state_list:
-            self._domain_state_list[domain] = []
-        self._domain_state_list[domain].append(site_state_data)
-        # 指定次数
-        max_records = max(1, int(self._failed_threshold)) if self._failed_threshold else 5
-        if len(self._domain_state_list[domain]) > max_records:
-            self._domain_state_list[domain] = self._domain_state_list[domain][-max_records:]
+            self._domain_state_list[domain] = StateWindow(self.__max_records())
+        self._domain_state_list[domain].push(site_state_data)
+        self._changed_domains.add(domain)
+        self._new_records.append(site_state_data)
+        self.__update_latency_stats(site_state_data)
+        if domain not in self._summaries:
+            self._summaries[domain] = SiteSummary()
+        self._summaries[domain].add(site_state_data, ProbeStore.to_ts(site_state_data.get("lst_mod_date")))
+
+    def __load_summaries(self, recent_records: Dict[str, List[dict]]):
+        """
+        从历史库加载详情页聚合数据的初始值，之后随每次检测增量更新
+        """
+        self._summaries = defaultdict(SiteSummary)
+        hourly, changes = self._store.aggregates(since=int(time.time()) - UptimeRing.SIZE * 3600)
+        for domain, hour, ok, total in hourly:
+            self._summaries[domain].uptime.add(hour, ok, total)
+        for domain, records in recent_records.items():
+            summary = self._summaries[domain]
+            for record in records:
+                summary.recent.append((record["lst_state"], record.get("latency")))
+            latest = records[-1]
+            summary.state = latest["lst_state"]
+            summary.tier = latest.get("tier")
+            summary.message = latest.get("lst_test_message") or ""
+            summary.last_probe = ProbeStore.to_ts(latest.get("lst_mod_date"))
+            summary.last_change = changes.get(domain, summary.last_probe)
+        self._summaries = dict(self._summaries)
+
+    def __update_latency_stats(self, record: dict):
+        """
+        访问成功的完整检测记录计入该站点的响应耗时统计
+        """
+        if record.get("lst_state") != 0 or record.get("latency") is None or record.get("tier") == self._TIER_LIGHT:
+            return
+        domain = record.get("domain")
+        if domain not in self._latency_stats:
+            self._latency_stats[domain] = LatencyStats()
+        self._latency_stats[domain].add(record["latency"])
 
-    def __check_state_failures(self, domain, _check_state_failures_domain, _sign_sites_domain):
+    def __is_degraded(self, domain: str) -> bool:
         """
-        单站访问失败次数阀值
+        站点最近一次访问成功，但平均响应耗时超过阀值
         """
-        if domain in self._domain_state_list:
-            total_failures = sum(1 for state in self._domain_state_list[domain] if state["lst_state"] == 1)
-            failed_threshold = max(1, int(self._failed_threshold)) if self._failed_threshold else 5
-            if total_failures >= int(failed_threshold) and domain not in _check_state_failures_domain and domain in _sign_sites_domain:
-                _check_state_failures_domain.append(domain)
-        return _check_state_failures_domain
+        stats = self._latency_stats.get(domain)
+        window = self._domain_state_list.get(domain)
+        return bool(stats and stats.ewma is not None and window and window.records[-1]["lst_state"] == 0
+                    and stats.ewma > self._latency_threshold)
+
+    def __max_records(self) -> int:
+        """
+        内存中每个站点保留的记录数，即失败次数阀值
+        """
+        return self.__to_int(self._failed_threshold, 5)
+
+    def __evaluate_failures(self) -> set:
+        """
+        单站访问失败次数阀值：只重新评估有新记录的站点
+        :return: 本次新达到阀值的站点
+        """
+        failed_threshold = self.__max_records()
+        newly_failing = set()
+        for domain in self._changed_domains:
+            window = self._domain_state_list.get(domain)
+            if window and window.failures >= failed_threshold:
+                if domain not in self._failing_domains:
+                    newly_failing.add(domain)
+                    self._failing_domains.add(domain)
+            else:
+                self._failing_domains.discard(domain)
+        self._changed_domains = set()
+        return newly_failing
+
+    def __probe(self, domain: str, fresh: bool = False) -> Tuple[Tuple[dict, int], bool]:
+        """
+        检测站点：有效期内的结果直接复用，同一站点进行中的检测合并为一次
+        :param fresh: 不复用缓存的结果（单站复查）
+        """
+        if self._probe_cache is None:
+            return self.__GetStateAndSendMassage(domain), False
+        return self._probe_cache.get(domain, self.__GetStateAndSendMassage, fresh=fresh)
+
+    def latest_state(self, domain: str) -> Optional[dict]:
+        """
+        站点最近一次的检测记录，不触发检测
+        """
+        cached = self._probe_cache.peek(domain) if self._probe_cache is not None else None
+        if cached:
+            return cached[0]
+        window = self._domain_state_list.get(domain)
+        return window.records[-1] if window and window.records else None
 
     def __GetStateAndSendMassage(self, domain: str):
         """
-        获取站点访问状态
+        获取站点访问状态：分层检测时轻量检测通过且未到完整检测时间则不再完整检测。
+        建连耗时来自轻量检测单独建立的直连（不经站点代理），并非 SiteChain.test 实际使用的连接，未开启分层检测时不记录
         """
+        connect = None
+        if self._tiered:
+            light = self.__light_probe(domain)
+            if light["ok"] and not self.__full_due(domain):
+                return self.__build_state(domain, 0, light["message"], latency=light["latency"],
+                                          connect=light["connect"], tier=self._TIER_LIGHT), 0
+            connect = light["connect"]
+        self._last_full[domain] = time.time()
+        start = time.perf_counter()
         test_state, test_message =  self.sitechain.test(domain)
+        latency = round((time.perf_counter() - start) * 1000, 1)
         lst_mod_date = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
         if test_message:
@@ -234,31 +1241,86 @@ class AutoDomainState(_PluginBase):
             lst_test_message = f"没有返回信息"
         if test_state:
             lst_state = 0
-            domian_state = {
-                # 站点
-                "domain": domain,
-                # 最后测试访问状态 0-成功 1-失败
-                "lst_state": lst_state,
-                # 最后测试访问时间
-                "lst_mod_date": lst_mod_date,
-                # 最后测试访问返回的信息
-                "lst_test_message": lst_test_message
-            }
-            return domian_state, lst_state
         else:
             lst_state = 1
             logger.info(f"当前测试站点连接性结果 {domain}：{lst_state} , {lst_test_message}")
-            domian_state = {
-                # 站点
-                "domain": domain,
-                # 最后测试访问状态 0-成功 1-失败
-                "lst_state": lst_state,
-                # 最后测试访问时间
-                "lst_mod_date": lst_mod_date,
-                # 最后测试访问返回的信息
-                "lst_test_message": lst_test_message
-            }
-            return domian_state, lst_state
+        status = self._STATUS_PATTERN.search(lst_test_message)
+        return self.__build_state(domain, lst_state, lst_test_message, lst_mod_date,
+                                  latency=latency, connect=connect,
+                                  status=int(status.group(1)) if status else None,
+                                  tier=self._TIER_FULL), lst_state
+
+    def __full_due(self, domain: str) -> bool:
+        """
+        是否需要完整检测：从未完整检测过、上次检测失败或距上次完整检测已超过间隔
+        """
+        window = self._domain_state_list.get(domain)
+        if not window or not window.records or window.records[-1]["lst_state"] != 0:
+            return True
+        last_full = self._last_full.get(domain)
+        return last_full is None or time.time() - last_full >= self._full_interval * 60
+
+    def __light_probe(self, domain: str) -> Dict[str, Any]:
+        """
+        轻量检测：DNS 解析 + TCP 建连 + TLS 握手，各阶段耗时为毫秒
+        :return: {"ok", "message", "latency", "connect"}，connect 为 TCP 建连耗时，失败时为 None
+        """
+        parsed = urlparse(domain if "://" in domain else f"//{domain}")
+        result = {"ok": False, "message": "", "latency": None, "connect": None}
+        if not parsed.hostname:
+            result["message"] = "轻量检测失败：域名无效"
+            return result
+        port = parsed.port or (80 if parsed.scheme == "http" else 443)
+        timeout = min(10, self._probe_timeout)
+        start = time.perf_counter()
+        stage = "DNS解析"
+        try:
+            address = socket.getaddrinfo(parsed.hostname, port, type=socket.SOCK_STREAM)[0][4]
+            dns = time.perf_counter()
+            stage = "TCP建连"
+            with socket.create_connection(address[:2], timeout=timeout) as sock:
+                tcp = time.perf_counter()
+                result["connect"] = round((tcp - dns) * 1000, 1)
+                tls = tcp
+                if parsed.scheme != "http":
+                    stage = "TLS握手"
+                    with self._SSL_CONTEXT.wrap_socket(sock, server_hostname=parsed.hostname):
+                        tls = time.perf_counter()
+        except (OSError, ValueError) as e:
+            result["message"] = f"轻量检测失败：{stage}出错 {e}"
+            return result
+        result["ok"] = True
+        result["latency"] = round((tls - start) * 1000, 1)
+        result["message"] = (f"轻量检测通过：DNS {(dns - start) * 1000:.0f}ms，TCP {result['connect']:.0f}ms"
+                             + (f"，TLS {(tls - tcp) * 1000:.0f}ms" if tls != tcp else ""))
+        return result
+
+    @staticmethod
+    def __build_state(domain: str, lst_state: int, lst_test_message: str, lst_mod_date: str = None,
+                      latency: float = None, connect: float = None, status: int = None, tier: str = None) -> dict:
+        """
+        构建单次访问状态记录
+        """
+        return {
+            # 站点
+            "domain": domain,
+            # 最后测试访问状态 0-成功 1-失败
+            "lst_state": lst_state,
+            # 最后测试访问时间
+            "lst_mod_date": lst_mod_date or datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            # 最后测试访问返回的信息
+            "lst_test_message": lst_test_message,
+            # 站点测试总耗时（毫秒）
+            "latency": latency,
+            # 轻量检测的 TCP 建连耗时（毫秒），为单独建立的直连，仅分层检测时记录
+            "connect": connect,
+            # HTTP 状态码
+            "status": status,
+            # 检测层级 light-轻量检测 full-完整检测
+            "tier": tier,
+            # 是否已计入站点状态记录（检测结果可能被多个触发方共享）
+            "recorded": False
+        }
 
     def __custom_sites(self) -> List[Any]:
         custom_sites = []
@@ -285,50 +1347,122 @@ class AutoDomainState(_PluginBase):
 
         return do_sites
 
-    def _run_concurrent_tasks(self, task_func, task_args_list: List[Any], max_workers: int = 50, timeout: int = 20) -> List[Dict]:
+    def reprobe(self, domains: List[str], channel: Any = None, userid: Any = None) -> Dict[str, Any]:
         """
-        通用多线程任务执行函数（返回按任务参数顺序排列的结果列表）
-        :param task_func: 需要并行执行的任务函数
-        :param task_args_list: 任务参数列表（每个元素对应任务函数的一个参数）
-        :param max_workers: 最大线程数（默认50）
-        :return: 包含所有任务结果的列表，格式为 [{"arg": arg, "result": data, "error": None}, ...]
+        立即复查指定站点，同一站点已在复查中的请求合并到进行中的检测
+        :param domains: 站点域名、网址或站点名称
+        :return: 各站点的受理情况
         """
-        results = [None] * len(task_args_list)  # 初始化占位列表
-        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
-            # 提交任务并记录索引
-            future_to_index = {
-                executor.submit(task_func, arg): idx
-                for idx, arg in enumerate(task_args_list)
-            }
-            # 处理结果
-            for future in concurrent.futures.as_completed(future_to_index):
-                idx = future_to_index[future]
-                arg = task_args_list[idx]
-                try:
-                    result = future.result(timeout=timeout)
-                    results[idx] = {"arg": arg, "result": result, "error": None}
-                except Exception as e:
-                    results[idx] = {"arg": arg, "result": None, "error": str(e)}
-        return results
+        queued, coalesced, unknown = [], [], []
+        for key in domains:
+            site = self._catalogue.resolve(key)
+            if not site:
+                unknown.append(key)
+                continue
+            if site["domain"] in queued or site["domain"] in coalesced:
+                continue
+            with self._reprobe_lock:
+                if site["domain"] in self._reprobing:
+                    coalesced.append(site["domain"])
+                    continue
+                self._reprobing.add(site["domain"])
+            queued.append(site["domain"])
+        if queued:
+            logger.info(f"复查站点：{queued}，合并到进行中的复查：{coalesced}，未知站点：{unknown}")
+            threading.Thread(target=self.__reprobe, args=(queued, channel, userid),
+                             name="autodomainstate-reprobe", daemon=True).start()
+        return {"queued": queued, "coalesced": coalesced, "unknown": unknown}
+
+    def __reprobe(self, domains: List[str], channel: Any = None, userid: Any = None):
+        """
+        执行复查，完成后向发起命令的用户回复检测结果
+        """
+        # 复查时不复用缓存结果且完整检测（同一站点正在进行的检测除外，直接合并其结果）
+        for domain in domains:
+            self._last_full.pop(domain, None)
+        try:
+            self.__runOnlyonce(domains=set(domains), targeted=True)
+        except Exception as e:
+            logger.error(f"复查站点 {domains} 失败：{e}")
+        finally:
+            with self._reprobe_lock:
+                self._reprobing.difference_update(domains)
+        if channel is None and userid is None:
+            return
+        lines = []
+        for domain in domains:
+            record = self.latest_state(domain)
+            if not record:
+                lines.append(f"{self._catalogue.name(domain)}({domain})：未获取到检测结果")
+                continue
+            latency = f"，耗时{record['latency']:.0f}ms" if record.get("latency") is not None else ""
+            lines.append(f"{self._catalogue.name(domain)}({domain})：{'正常' if record['lst_state'] == 0 else '访问失败'}"
+                         f"{latency}，{record['lst_test_message']}")
+        self.post_message(channel=channel, title=f"【监测站点访问状态插件提醒】",
+                          text="\n".join(lines), userid=userid)
+
+    @eventmanager.register(EventType.PluginAction)
+    def reprobe_event(self, event: Event):
+        """
+        响应单站复查命令，或其他插件发现站点异常时发出的复查事件
+        event_data: {"action": "autodomainstate_reprobe", "domains": [...]} 或命令参数 arg_str（多个站点以空格、逗号分隔）
+        """
+        event_data = event.event_data if event else None
+        if not event_data or event_data.get("action") != self._REPROBE_ACTION:
+            return
+        domains = event_data.get("domains") or re.split(r"[\s,，]+", event_data.get("arg_str") or "")
+        if isinstance(domains, str):
+            domains = [domains]
+        domains = [domain for domain in domains if domain]
+        channel, userid = event_data.get("channel"), event_data.get("userid")
+        if not domains:
+            if channel is not None or userid is not None:
+                self.post_message(channel=channel, title=f"【监测站点访问状态插件提醒】",
+                                  text="请在命令后指定需要复查的站点域名或名称，多个站点以空格分隔", userid=userid)
+            return
+        result = self.reprobe(domains, channel=channel, userid=userid)
+        if result["unknown"] and (channel is not None or userid is not None):
+            self.post_message(channel=channel, title=f"【监测站点访问状态插件提醒】",
+                              text=f"未找到站点：{result['unknown']}", userid=userid)
+
+    def reprobe_api(self, domains: str) -> Dict[str, Any]:
+        """
+        复查站点接口，多个站点以逗号分隔
+        """
+        return self.reprobe([domain for domain in re.split(r"[\s,，]+", domains or "") if domain])
 
     @staticmethod
     def get_command() -> List[Dict[str, Any]]:
-        pass
+        return [
+            {
+                "cmd": "/domain_reprobe",
+                "event": EventType.PluginAction,
+                "desc": "立即复查站点访问状态",
+                "category": "站点",
+                "data": {
+                    "action": AutoDomainState._REPROBE_ACTION
+                }
+            }
+        ]
 
     def get_api(self) -> List[Dict[str, Any]]:
-        pass
+        return [
+            {
+                "path": "/reprobe",
+                "endpoint": self.reprobe_api,
+                "methods": ["POST"],
+                "summary": "复查站点",
+                "description": "立即复查指定站点的访问状态，参数 domains 为站点域名或名称，多个以逗号分隔；同一站点进行中的复查会被合并",
+                "auth": "bear"
+            }
+        ]
 
     def get_form(self) -> Tuple[List[dict], Dict[str, Any]]:
         """
         拼装插件配置页面，需要返回两块数据：1、页面配置；2、数据结构
         """
         # 站点的可选项（内置站点 + 自定义站点）(排除未启用站点)
-        customSites = self.__custom_sites()
-
-        site_options = ([{"title": site.name, "value": site.id}
-                         for site in self.siteoper.list_active()]
-                        + [{"title": site.get("name"), "value": site.get("id")}
-                           for site in customSites])
+        site_options = [{"title": site["name"], "value": site["id"]} for site in self._catalogue.sites]
         return [
             {
                 'component': 'VForm',
@@ -462,36 +1596,33 @@ class AutoDomainState(_PluginBase):
                         'content': [
                             {
                                 'component': 'VCol',
+                                'props': {
+                                    'cols': 12,
+                                    'md': 3
+                                },
                                 'content': [
                                     {
-                                        'component': 'VSelect',
+                                        'component': 'VSwitch',
                                         'props': {
-                                            'chips': True,
-                                            'multiple': True,
-                                            'model': 'sign_sites',
-                                            'label': '监测站点',
-                                            'items': site_options
+                                            'model': 'adaptive',
+                                            'label': '自适应检测',
                                         }
                                     }
                                 ]
-                            }
-                        ]
-                    },
-                    {
-                        'component': 'VRow',
-                        'content': [
+                            },
                             {
                                 'component': 'VCol',
                                 'props': {
                                     'cols': 12,
+                                    'md': 3
                                 },
                                 'content': [
                                     {
-                                        'component': 'VAlert',
+                                        'component': 'VTextField',
                                         'props': {
-                                            'type': 'info',
-                                            'variant': 'tonal',
-                                            'text': '插件每次运行都会测试选定站点的连接性状态，并且迭代暂存最新检测结果。插件会根据每各个站点暂存的数据综合判断：如果选定站点 记录的访问失败总次数 超过或等于设定的阀值,则会发出指定通知提醒。'
+                                            'model': 'probe_interval',
+                                            'label': '基础检测间隔(分钟)',
+                                            'placeholder': '留空则自动默认为60分钟'
                                         }
                                     }
                                 ]
@@ -500,17 +1631,347 @@ class AutoDomainState(_PluginBase):
                                 'component': 'VCol',
                                 'props': {
                                     'cols': 12,
+                                    'md': 3
                                 },
                                 'content': [
                                     {
-                                        'component': 'VAlert',
+                                        'component': 'VTextField',
                                         'props': {
-                                            'type': 'info',
-                                            'variant': 'tonal',
+                                            'model': 'min_interval',
+                                            'label': '异常站点复查间隔(分钟)',
+                                            'placeholder': '留空则自动默认为5分钟'
+                                        }
+                                    }
+                                ]
+                            },
+                            {
+                                'component': 'VCol',
+                                'props': {
+                                    'cols': 12,
+                                    'md': 3
+                                },
+                                'content': [
+                                    {
+                                        'component': 'VTextField',
+                                        'props': {
+                                            'model': 'max_interval',
+                                            'label': '稳定站点最大间隔(分钟)',
+                                            'placeholder': '留空则自动默认为360分钟'
+                                        }
+                                    }
+                                ]
+                            }
+                        ]
+                    },
+                    {
+                        'component': 'VRow',
+                        'content': [
+                            {
+                                'component': 'VCol',
+                                'props': {
+                                    'cols': 12,
+                                    'md': 4
+                                },
+                                'content': [
+                                    {
+                                        'component': 'VTextField',
+                                        'props': {
+                                            'model': 'probe_concurrency',
+                                            'label': '最大并发检测数',
+                                            'placeholder': '留空则自动默认为50'
+                                        }
+                                    }
+                                ]
+                            },
+                            {
+                                'component': 'VCol',
+                                'props': {
+                                    'cols': 12,
+                                    'md': 4
+                                },
+                                'content': [
+                                    {
+                                        'component': 'VTextField',
+                                        'props': {
+                                            'model': 'probe_per_host',
+                                            'label': '单主机最大并发检测数',
+                                            'placeholder': '留空则自动默认为2'
+                                        }
+                                    }
+                                ]
+                            },
+                            {
+                                'component': 'VCol',
+                                'props': {
+                                    'cols': 12,
+                                    'md': 4
+                                },
+                                'content': [
+                                    {
+                                        'component': 'VTextField',
+                                        'props': {
+                                            'model': 'latency_threshold',
+                                            'label': '响应缓慢阀值(毫秒)',
+                                            'placeholder': '留空则不检测响应耗时'
+                                        }
+                                    }
+                                ]
+                            }
+                        ]
+                    },
+                    {
+                        'component': 'VRow',
+                        'content': [
+                            {
+                                'component': 'VCol',
+                                'props': {
+                                    'cols': 12,
+                                    'md': 4
+                                },
+                                'content': [
+                                    {
+                                        'component': 'VTextField',
+                                        'props': {
+                                            'model': 'probe_timeout',
+                                            'label': '单站检测超时(秒)',
+                                            'placeholder': '留空则自动默认为60秒，超时记为访问失败'
+                                        }
+                                    }
+                                ]
+                            },
+                            {
+                                'component': 'VCol',
+                                'props': {
+                                    'cols': 12,
+                                    'md': 4
+                                },
+                                'content': [
+                                    {
+                                        'component': 'VTextField',
+                                        'props': {
+                                            'model': 'sweep_timeout',
+                                            'label': '整轮检测超时(秒)',
+                                            'placeholder': '留空则自动默认为600秒'
+                                        }
+                                    }
+                                ]
+                            },
+                            {
+                                'component': 'VCol',
+                                'props': {
+                                    'cols': 12,
+                                    'md': 4
+                                },
+                                'content': [
+                                    {
+                                        'component': 'VTextField',
+                                        'props': {
+                                            'model': 'retention_days',
+                                            'label': '历史记录保留天数',
+                                            'placeholder': '留空则自动默认为30天'
+                                        }
+                                    }
+                                ]
+                            }
+                        ]
+                    },
+                    {
+                        'component': 'VRow',
+                        'content': [
+                            {
+                                'component': 'VCol',
+                                'props': {
+                                    'cols': 12,
+                                    'md': 4
+                                },
+                                'content': [
+                                    {
+                                        'component': 'VTextField',
+                                        'props': {
+                                            'model': 'probe_rate',
+                                            'label': '每秒最多发起检测数',
+                                            'placeholder': '留空则自动默认为10，0为不限制'
+                                        }
+                                    }
+                                ]
+                            },
+                            {
+                                'component': 'VCol',
+                                'props': {
+                                    'cols': 12,
+                                    'md': 4
+                                },
+                                'content': [
+                                    {
+                                        'component': 'VTextField',
+                                        'props': {
+                                            'model': 'host_spacing',
+                                            'label': '同主机检测间隔(秒)',
+                                            'placeholder': '留空则自动默认为2秒'
+                                        }
+                                    }
+                                ]
+                            },
+                            {
+                                'component': 'VCol',
+                                'props': {
+                                    'cols': 12,
+                                    'md': 4
+                                },
+                                'content': [
+                                    {
+                                        'component': 'VTextField',
+                                        'props': {
+                                            'model': 'dispatch_window',
+                                            'label': '随机错开窗口(秒)',
+                                            'placeholder': '留空则自动默认为10秒'
+                                        }
+                                    }
+                                ]
+                            }
+                        ]
+                    },
+                    {
+                        'component': 'VRow',
+                        'content': [
+                            {
+                                'component': 'VCol',
+                                'props': {
+                                    'cols': 12,
+                                    'md': 4
+                                },
+                                'content': [
+                                    {
+                                        'component': 'VTextField',
+                                        'props': {
+                                            'model': 'cache_ttl',
+                                            'label': '检测结果复用时间(秒)',
+                                            'placeholder': '留空则自动默认为60秒，0为不复用'
+                                        }
+                                    }
+                                ]
+                            },
+                            {
+                                'component': 'VCol',
+                                'props': {
+                                    'cols': 12,
+                                    'md': 4
+                                },
+                                'content': [
+                                    {
+                                        'component': 'VSwitch',
+                                        'props': {
+                                            'model': 'tiered',
+                                            'label': '分层检测',
+                                        }
+                                    }
+                                ]
+                            },
+                            {
+                                'component': 'VCol',
+                                'props': {
+                                    'cols': 12,
+                                    'md': 4
+                                },
+                                'content': [
+                                    {
+                                        'component': 'VTextField',
+                                        'props': {
+                                            'model': 'full_interval',
+                                            'label': '完整检测间隔(分钟)',
+                                            'placeholder': '留空则自动默认为360分钟'
+                                        }
+                                    }
+                                ]
+                            }
+                        ]
+                    },
+                    {
+                        'component': 'VRow',
+                        'content': [
+                            {
+                                'component': 'VCol',
+                                'content': [
+                                    {
+                                        'component': 'VSelect',
+                                        'props': {
+                                            'chips': True,
+                                            'multiple': True,
+                                            'model': 'sign_sites',
+                                            'label': '监测站点',
+                                            'items': site_options
+                                        }
+                                    }
+                                ]
+                            }
+                        ]
+                    },
+                    {
+                        'component': 'VRow',
+                        'content': [
+                            {
+                                'component': 'VCol',
+                                'props': {
+                                    'cols': 12,
+                                },
+                                'content': [
+                                    {
+                                        'component': 'VAlert',
+                                        'props': {
+                                            'type': 'info',
+                                            'variant': 'tonal',
+                                            'text': '插件每次运行都会测试选定站点的连接性状态，并且迭代暂存最新检测结果。插件会根据每各个站点暂存的数据综合判断：如果选定站点 记录的访问失败总次数 超过或等于设定的阀值,则会发出指定通知提醒。'
+                                        }
+                                    }
+                                ]
+                            },
+                            {
+                                'component': 'VCol',
+                                'props': {
+                                    'cols': 12,
+                                },
+                                'content': [
+                                    {
+                                        'component': 'VAlert',
+                                        'props': {
+                                            'type': 'info',
+                                            'variant': 'tonal',
                                             'text': '如果启用立即运行一次，会全量测试所选站点的连接性状态，需要点时间，日志刷新可查看检测结果。'
                                         }
                                     }
                                 ]
+                            },
+                            {
+                                'component': 'VCol',
+                                'props': {
+                                    'cols': 12,
+                                },
+                                'content': [
+                                    {
+                                        'component': 'VAlert',
+                                        'props': {
+                                            'type': 'info',
+                                            'variant': 'tonal',
+                                            'text': '启用分层检测后，每次检测先做轻量检测（DNS解析、TCP建连及TLS握手），仅在轻量检测失败、站点上次检测失败或距上次完整检测超过完整检测间隔时才完整测试站点，可大幅减少对站点的访问。轻量检测直接连接站点、不经过站点设置的代理，记录的建连耗时也来自这一单独的连接。'
+                                        }
+                                    }
+                                ]
+                            },
+                            {
+                                'component': 'VCol',
+                                'props': {
+                                    'cols': 12,
+                                },
+                                'content': [
+                                    {
+                                        'component': 'VAlert',
+                                        'props': {
+                                            'type': 'info',
+                                            'variant': 'tonal',
+                                            'text': '启用自适应检测后不再使用执行周期，各站点按自身状态独立安排检测：访问失败或响应缓慢的站点按复查间隔起步、逐次加倍复查，稳定的站点逐次加倍拉长间隔直至最大间隔。'
+                                        }
+                                    }
+                                ]
                             }
                         ]
                     }
@@ -524,6 +1985,22 @@ class AutoDomainState(_PluginBase):
             'clean': False,
             'cron': '',
             'failed_threshold': '',
+            'probe_concurrency': '50',
+            'probe_per_host': '2',
+            'probe_timeout': '60',
+            'sweep_timeout': '600',
+            'probe_rate': '10',
+            'host_spacing': '2',
+            'dispatch_window': '10',
+            'cache_ttl': '60',
+            'tiered': False,
+            'full_interval': '360',
+            'retention_days': '30',
+            'latency_threshold': '',
+            'adaptive': False,
+            'probe_interval': '60',
+            'min_interval': '5',
+            'max_interval': '360',
             "sign_sites": []
         }
 
@@ -533,17 +2010,164 @@ class AutoDomainState(_PluginBase):
         删除对应站点选中
         """
         site_id = event.event_data.get("site_id")
+        if self._catalogue is not None:
+            self._catalogue.invalidate()
         config = self.get_config()
         if config:
             self._sign_sites = self.__remove_site_id(config.get("sign_sites") or [], site_id)
             # 保存配置
             self.__update_config()
 
+    @eventmanager.register(EventType.SiteUpdated)
+    def site_updated(self, event):
+        """
+        站点信息变更后刷新站点目录
+        """
+        if self._catalogue is not None:
+            self._catalogue.invalidate()
+
     def get_page(self) -> List[dict]:
         """
         拼装插件详情页面，需要返回页面配置，同时附带数据
         """
-        pass
+        hour = int(time.time()) // 3600
+        counts = {"正常": 0, "访问失败": 0, "响应缓慢": 0, "未检测": 0}
+        rows = []
+        domains = self._catalogue.domains(self._sign_sites)
+        with self._state_lock:
+            for domain in domains:
+                self.__page_row(domain, hour, counts, rows)
+        summary_cards = [("监测站点", len(domains))] + list(counts.items())
+        return [
+            {
+                'component': 'VRow',
+                'content': [
+                    {
+                        'component': 'VCol',
+                        'props': {
+                            'cols': 12,
+                            'md': 2
+                        },
+                        'content': [
+                            {
+                                'component': 'VCard',
+                                'props': {
+                                    'variant': 'tonal'
+                                },
+                                'content': [
+                                    {
+                                        'component': 'VCardText',
+                                        'text': f"{title}：{value}"
+                                    }
+                                ]
+                            }
+                        ]
+                    } for title, value in summary_cards
+                ]
+            },
+            self.__page_table("站点访问状态",
+                              ["站点", "状态", "最后变化", "最后检测", "24小时可用率", "7天可用率", "30天可用率",
+                               "P95耗时", "近期走势"], rows)
+        ]
+
+    def __page_row(self, domain: str, hour: int, counts: Dict[str, int], rows: List[list]):
+        """
+        详情页单站数据行，仅读取增量维护的聚合数据
+        """
+        def fmt_time(ts: Optional[int]) -> str:
+            return datetime.fromtimestamp(ts).strftime("%Y-%m-%d %H:%M") if ts else "-"
+
+        def fmt_uptime(value: Optional[float]) -> str:
+            return f"{value:.1f}%" if value is not None else "-"
+
+        summary = self._summaries.get(domain)
+        if not summary or summary.state is None:
+            state = "未检测"
+        elif domain in self._failing_domains or summary.state != 0:
+            state = "访问失败"
+        elif domain in self._degraded_domains:
+            state = "响应缓慢"
+        else:
+            state = "正常"
+        counts[state] += 1
+        if not summary:
+            rows.append([f"{self._catalogue.name(domain)}（{domain}）", state] + ["-"] * 7)
+            return
+        summary.uptime.advance(hour)
+        stats = self._latency_stats.get(domain)
+        p95 = stats.quantile() if stats else None
+        rows.append([
+            f"{self._catalogue.name(domain)}（{domain}）",
+            state,
+            fmt_time(summary.last_change),
+            fmt_time(summary.last_probe),
+            *[fmt_uptime(summary.uptime.uptime(window)) for window in UptimeRing.WINDOWS],
+            f"≤{p95}ms" if p95 is not None else "-",
+            summary.sparkline() or "-"
+        ])
+
+    @staticmethod
+    def __page_table(title: str, headers: List[str], rows: List[list]) -> dict:
+        """
+        详情页表格
+        """
+        return {
+            'component': 'VRow',
+            'content': [
+                {
+                    'component': 'VCol',
+                    'props': {
+                        'cols': 12
+                    },
+                    'content': [
+                        {
+                            'component': 'div',
+                            'props': {
+                                'class': 'text-subtitle-1 mt-2'
+                            },
+                            'text': title
+                        },
+                        {
+                            'component': 'VTable',
+                            'props': {
+                                'hover': True
+                            },
+                            'content': [
+                                {
+                                    'component': 'thead',
+                                    'content': [
+                                        {
+                                            'component': 'th',
+                                            'props': {
+                                                'class': 'text-start ps-4'
+                                            },
+                                            'text': header
+                                        } for header in headers
+                                    ]
+                                },
+                                {
+                                    'component': 'tbody',
+                                    'content': [
+                                        {
+                                            'component': 'tr',
+                                            'content': [
+                                                {
+                                                    'component': 'td',
+                                                    'props': {
+                                                        'class': 'ps-4'
+                                                    },
+                                                    'text': str(cell)
+                                                } for cell in row
+                                            ]
+                                        } for row in rows
+                                    ]
+                                }
+                            ]
+                        }
+                    ]
+                }
+            ]
+        }
 
     def stop_service(self):
         """
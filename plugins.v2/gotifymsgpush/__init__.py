@@ -1,6 +1,24 @@
-from typing import Any, List, Dict, Tuple
+import bisect
+import hashlib
+import heapq
+import itertools
+import json
+import random
+import string
+import threading
+import time
+from collections import deque, defaultdict, OrderedDict, Counter
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, List, Dict, Tuple, Callable, Optional, NamedTuple, Mapping
 from urllib.parse import quote_plus
 
+from fastapi.responses import PlainTextResponse
+from requests import Session
+from requests.adapters import HTTPAdapter
+
 from app.core.event import eventmanager, Event
 from app.log import logger
 from app.plugins import _PluginBase
@@ -8,6 +26,890 @@ from app.schemas.types import EventType, NotificationType
 from app.utils.http import RequestUtils
 
 
+class TokenBucket:
+    """
+    令牌桶限速：按固定速率补充令牌，允许一定的突发
+    """
+
+    def __init__(self, rate: float = 0, burst: int = 5):
+        """
+        :param rate: 每秒补充的令牌数，0 表示不限速
+        :param burst: 令牌桶容量，即允许的最大突发数
+        """
+        self._rate = max(0.0, rate)
+        self._burst = max(1, burst)
+        self._tokens = float(self._burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    @property
+    def unlimited(self) -> bool:
+        return self._rate <= 0
+
+    def acquire(self, stop: threading.Event) -> bool:
+        """
+        获取一个令牌，令牌不足时等待，stop 被设置时放弃并返回 False
+        """
+        if self.unlimited:
+            return True
+        while not stop.is_set():
+            with self._lock:
+                self.__refill()
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return True
+                wait = (1 - self._tokens) / self._rate
+            stop.wait(wait)
+        return False
+
+    def refund(self):
+        """
+        归还一个未使用的令牌
+        """
+        if self.unlimited:
+            return
+        with self._lock:
+            self._tokens = min(float(self._burst), self._tokens + 1)
+
+    def penalize(self):
+        """
+        服务器返回限流时清空令牌，避免继续触发限流
+        """
+        if self.unlimited:
+            return
+        with self._lock:
+            self.__refill()
+            self._tokens = min(self._tokens, 0.0)
+
+    def __refill(self):
+        now = time.monotonic()
+        self._tokens = min(float(self._burst), self._tokens + (now - self._updated) * self._rate)
+        self._updated = now
+
+
+class DeliveryQueue:
+    """
+    有界内存投递队列：事件线程只负责入队，由后台工作线程执行实际推送。
+    队列按优先级分桶，同优先级先进先出，高优先级先发送、队列满时低优先级先丢弃
+    """
+    # 队列满时的处理策略
+    POLICY_DROP_OLDEST = "drop_oldest"
+    POLICY_DROP_NEWEST = "drop_newest"
+    POLICY_BLOCK = "block"
+
+    def __init__(self, handler: Callable[[dict], Any], maxsize: int = 1000, workers: int = 2,
+                 policy: str = POLICY_DROP_OLDEST, block_timeout: float = 5,
+                 limiter: Optional[TokenBucket] = None, metrics: Optional["DeliveryMetrics"] = None):
+        """
+        :param handler: 消费队列元素的处理函数
+        :param maxsize: 队列最大深度
+        :param workers: 工作线程数
+        :param policy: 队列满时的处理策略 drop_oldest/drop_newest/block
+        :param block_timeout: block 策略下入队的最长等待秒数，超时后丢弃新消息
+        :param limiter: 发送限速令牌桶
+        :param metrics: 推送指标，丢弃计数同时累计到其中（跨队列重建保留）
+        """
+        self._handler = handler
+        self._maxsize = max(1, maxsize)
+        self._workers_num = max(1, workers)
+        self._policy = policy
+        self._block_timeout = block_timeout
+        self._limiter = limiter or TokenBucket()
+        self._metrics = metrics
+        # 优先级 -> 消息队列
+        self._buckets: Dict[int, deque] = defaultdict(deque)
+        self._size = 0
+        self._lock = threading.Lock()
+        self._not_empty = threading.Condition(self._lock)
+        self._not_full = threading.Condition(self._lock)
+        self._idle = threading.Condition(self._lock)
+        self._inflight = 0
+        self._closing = False
+        self._running = False
+        self._stop_event = threading.Event()
+        self._workers: List[threading.Thread] = []
+        # 丢弃计数
+        self.dropped = 0
+
+    def start(self):
+        """
+        启动工作线程
+        """
+        with self._lock:
+            if self._running:
+                return
+            self._running = True
+            self._closing = False
+            self._stop_event.clear()
+        for idx in range(self._workers_num):
+            worker = threading.Thread(target=self.__worker, name=f"gotifymsgpush-{idx}", daemon=True)
+            worker.start()
+            self._workers.append(worker)
+
+    @property
+    def running(self) -> bool:
+        return self._running and not self._closing
+
+    @property
+    def limiter(self) -> TokenBucket:
+        return self._limiter
+
+    def qsize(self) -> int:
+        with self._lock:
+            return self._size
+
+    def put(self, item: dict, priority: int = 0) -> bool:
+        """
+        入队，返回是否成功入队
+        """
+        with self._lock:
+            if not self.running:
+                return False
+            if self._size >= self._maxsize:
+                lowest = min(rank for rank, items in self._buckets.items() if items)
+                if priority < lowest:
+                    # 新消息的优先级低于队列中所有消息，无论何种策略都直接丢弃新消息
+                    self.__drop()
+                    return False
+                if priority > lowest and self._policy != self.POLICY_BLOCK:
+                    # 优先丢弃低优先级的消息
+                    self.__evict(lowest, oldest=self._policy == self.POLICY_DROP_OLDEST)
+                elif self._policy == self.POLICY_DROP_NEWEST:
+                    self.__drop()
+                    return False
+                elif self._policy == self.POLICY_BLOCK:
+                    deadline = time.monotonic() + self._block_timeout
+                    while self._size >= self._maxsize and self.running:
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
+                            break
+                        self._not_full.wait(remaining)
+                    if self._size >= self._maxsize or not self.running:
+                        self.__drop()
+                        return False
+                else:
+                    self.__evict(lowest, oldest=True)
+            self._buckets[priority].append(item)
+            self._size += 1
+            self._not_empty.notify()
+            return True
+
+    def stop(self, timeout: float = 10):
+        """
+        停止接收新消息，在超时时间内尽量投递完队列中剩余的消息
+        """
+        deadline = time.monotonic() + timeout
+        with self._lock:
+            if not self._running:
+                return
+            self._closing = True
+            self._not_full.notify_all()
+            while self._size or self._inflight:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._idle.wait(remaining)
+            left = self._size
+            self._buckets.clear()
+            self._size = 0
+            self._running = False
+            self._stop_event.set()
+            self._not_empty.notify_all()
+        for worker in self._workers:
+            worker.join(timeout=max(0.0, deadline - time.monotonic()))
+        self._workers = []
+        if left:
+            self.__drop(left)
+            logger.warn(f"Gotify消息推送 投递队列停止时仍有 {left} 条消息未发送，已丢弃")
+
+    def __evict(self, rank: int, oldest: bool):
+        items = self._buckets[rank]
+        if oldest:
+            items.popleft()
+        else:
+            items.pop()
+        self._size -= 1
+        self.__drop()
+
+    def __drop(self, num: int = 1):
+        self.dropped += num
+        if self._metrics:
+            self._metrics.record_dropped(num)
+
+    def __pop(self) -> dict:
+        rank = max(rank for rank, items in self._buckets.items() if items)
+        self._size -= 1
+        return self._buckets[rank].popleft()
+
+    def __worker(self):
+        while True:
+            with self._lock:
+                while not self._size and self._running:
+                    self._not_empty.wait()
+                if not self._running:
+                    return
+            # 先取得令牌，再取出当前优先级最高的消息，等待期间到达的高优先级消息可以插队
+            if not self._limiter.acquire(self._stop_event):
+                return
+            with self._lock:
+                if not self._size:
+                    self._limiter.refund()
+                    continue
+                item = self.__pop()
+                self._inflight += 1
+                self._not_full.notify()
+            try:
+                self._handler(item)
+            except Exception as err:
+                logger.error(f"Gotify消息推送 投递线程处理消息出错：{err}")
+            finally:
+                with self._lock:
+                    self._inflight -= 1
+                    if not self._size and not self._inflight:
+                        self._idle.notify_all()
+
+
+class MessageCoalescer:
+    """
+    合并窗口：同一消息类型在窗口时间内到达的多条消息合并为一条摘要消息
+    """
+
+    def __init__(self, flush: Callable[[dict], Any], window_ms: int = 2000,
+                 max_items: int = 20, max_bytes: int = 4096):
+        """
+        :param flush: 合并完成后的输出函数
+        :param window_ms: 合并窗口（毫秒）
+        :param max_items: 单条摘要最多合并的消息数
+        :param max_bytes: 单条摘要最大字节数
+        """
+        self._flush = flush
+        self._window = max(1, window_ms) / 1000
+        self._max_items = max(1, max_items)
+        self._max_bytes = max(1, max_bytes)
+        self._lock = threading.Lock()
+        # 消息类型 -> {"items": [], "bytes": 0, "timer": Timer}
+        self._buckets: Dict[str, dict] = {}
+        self._closed = False
+
+    def add(self, key: str, message: dict) -> bool:
+        """
+        加入合并窗口，返回是否被接收
+        """
+        size = len((message.get("title") or "").encode("utf-8")) + len((message.get("text") or "").encode("utf-8"))
+        ready = []
+        with self._lock:
+            if self._closed:
+                return False
+            bucket = self._buckets.get(key)
+            if bucket and bucket["bytes"] + size > self._max_bytes:
+                # 超出字节上限，先输出已有内容
+                ready.append(self.__pop(key))
+                bucket = None
+            if not bucket:
+                timer = threading.Timer(self._window, self.__expire, args=(key,))
+                timer.daemon = True
+                bucket = {"items": [], "bytes": 0, "timer": timer}
+                self._buckets[key] = bucket
+                timer.start()
+            bucket["items"].append(message)
+            bucket["bytes"] += size
+            if len(bucket["items"]) >= self._max_items:
+                ready.append(self.__pop(key))
+        for items in ready:
+            self._flush(self.digest(items))
+        return True
+
+    def close(self):
+        """
+        停止接收新消息并立即输出所有未到期的合并内容
+        """
+        with self._lock:
+            self._closed = True
+            ready = [self.__pop(key) for key in list(self._buckets.keys())]
+        for items in ready:
+            self._flush(self.digest(items))
+
+    def __expire(self, key: str):
+        with self._lock:
+            if key not in self._buckets:
+                return
+            items = self.__pop(key)
+        self._flush(self.digest(items))
+
+    def __pop(self, key: str) -> List[dict]:
+        bucket = self._buckets.pop(key)
+        bucket["timer"].cancel()
+        return bucket["items"]
+
+    @staticmethod
+    def digest(items: List[dict]) -> dict:
+        """
+        将多条消息合并为一条摘要消息，其余字段沿用第一条消息
+        """
+        if len(items) == 1:
+            return items[0]
+        mtype: Optional[NotificationType] = items[0].get("mtype")
+        title = f"【{mtype.value if mtype else '消息'}】共 {len(items)} 条消息"
+        text = "\n\n".join(f"{item.get('title')}\n{item.get('text')}"
+                            if item.get("title") != item.get("text") else f"{item.get('text')}"
+                            for item in items)
+        return {
+            **items[0],
+            "title": title,
+            "text": text
+        }
+
+
+class RetryScheduler:
+    """
+    重试调度：按指数退避加随机抖动的延迟，到期后重新提交消息
+    """
+
+    def __init__(self, submit: Callable[[dict], Any], base_delay: float = 2, max_delay: float = 300):
+        """
+        :param submit: 到期后重新提交消息的函数
+        :param base_delay: 首次重试的基础延迟（秒）
+        :param max_delay: 最大延迟（秒）
+        """
+        self._submit = submit
+        self._base_delay = base_delay
+        self._max_delay = max_delay
+        self._heap: List[Tuple[float, int, dict]] = []
+        self._counter = itertools.count()
+        self._cond = threading.Condition()
+        self._running = False
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        with self._cond:
+            if self._running:
+                return
+            self._running = True
+        self._thread = threading.Thread(target=self.__run, name="gotifymsgpush-retry", daemon=True)
+        self._thread.start()
+
+    def backoff(self, attempt: int) -> float:
+        """
+        计算第 attempt 次重试的延迟：指数退避，取一半固定加一半随机抖动
+        """
+        delay = min(self._max_delay, self._base_delay * (2 ** max(0, attempt - 1)))
+        return delay / 2 + random.uniform(0, delay / 2)
+
+    def schedule(self, message: dict, delay: float) -> bool:
+        with self._cond:
+            if not self._running:
+                return False
+            heapq.heappush(self._heap, (time.monotonic() + delay, next(self._counter), message))
+            self._cond.notify()
+            return True
+
+    def pending(self) -> int:
+        with self._cond:
+            return len(self._heap)
+
+    def stop(self) -> List[dict]:
+        """
+        停止调度，返回尚未到期的消息
+        """
+        with self._cond:
+            self._running = False
+            left = [item[2] for item in self._heap]
+            self._heap = []
+            self._cond.notify_all()
+        if self._thread:
+            self._thread.join(timeout=1)
+            self._thread = None
+        return left
+
+    def __run(self):
+        while True:
+            with self._cond:
+                while self._running and (not self._heap or self._heap[0][0] > time.monotonic()):
+                    self._cond.wait(self._heap[0][0] - time.monotonic() if self._heap else None)
+                if not self._running:
+                    return
+                _, _, message = heapq.heappop(self._heap)
+            try:
+                self._submit(message)
+            except Exception as err:
+                logger.error(f"Gotify消息推送 重新提交重试消息出错：{err}")
+
+
+class Outbox:
+    """
+    本地发件箱：重试耗尽的消息以 JSON Lines 追加写入插件数据目录，服务器恢复后重放
+    """
+
+    def __init__(self, path: Path, max_items: int = 1000):
+        self._path = path
+        self._max_items = max(1, max_items)
+        self._lock = threading.Lock()
+        self._count = 0
+        # 推送目标 -> 待补发消息数，未指定目标的消息记在空字符串下
+        self._pending: Counter = Counter()
+        if self._path.exists():
+            self.__recount(self.__read())
+
+    def __len__(self) -> int:
+        return self._count
+
+    def pending(self, target: str) -> int:
+        """
+        可由指定推送目标补发的消息数（含未指定目标的消息）
+        """
+        with self._lock:
+            return self._pending[target] + self._pending[""]
+
+    @staticmethod
+    def __targets(message: dict) -> List[str]:
+        return message.get("targets") or [""]
+
+    def __recount(self, lines: List[str]):
+        self._count = len(lines)
+        self._pending = Counter()
+        for line in lines:
+            try:
+                self._pending.update(self.__targets(json.loads(line)))
+            except Exception:
+                continue
+
+    def append(self, messages: List[dict]):
+        """
+        追加消息，超出上限时仅保留最新的记录
+        """
+        if not messages:
+            return
+        with self._lock:
+            with open(self._path, 'a', encoding='utf-8') as file:
+                for message in messages:
+                    file.write(json.dumps(self.__dump(message), ensure_ascii=False) + "\n")
+            self._count += len(messages)
+            for message in messages:
+                self._pending.update(self.__targets(message))
+            if self._count > self._max_items:
+                lines = self.__read()[-self._max_items:]
+                with open(self._path, 'w', encoding='utf-8') as file:
+                    file.writelines(lines)
+                self.__recount(lines)
+
+    def drain(self, accept: Optional[Callable[[dict], bool]] = None) -> List[dict]:
+        """
+        取出消息，accept 为空时取出全部，否则只取出满足条件的消息，其余保留
+        """
+        messages = []
+        with self._lock:
+            if not self._count:
+                return []
+            kept = []
+            pending = Counter()
+            for line in self.__read():
+                try:
+                    message = self.__load(json.loads(line))
+                except Exception as err:
+                    logger.warn(f"Gotify消息推送 发件箱记录解析失败：{err}")
+                    continue
+                if accept and not accept(message):
+                    kept.append(line)
+                    pending.update(self.__targets(message))
+                else:
+                    messages.append(message)
+            if kept:
+                with open(self._path, 'w', encoding='utf-8') as file:
+                    file.writelines(kept)
+            else:
+                self._path.unlink(missing_ok=True)
+            self._count = len(kept)
+            self._pending = pending
+        return messages
+
+    def __read(self) -> List[str]:
+        if not self._path.exists():
+            return []
+        with open(self._path, 'r', encoding='utf-8') as file:
+            return [line for line in file if line.strip()]
+
+    @staticmethod
+    def __dump(message: dict) -> dict:
+        data = dict(message)
+        mtype = data.get("mtype")
+        data["mtype"] = mtype.name if mtype else None
+        return data
+
+    @staticmethod
+    def __load(data: dict) -> dict:
+        mtype = data.get("mtype")
+        data["mtype"] = NotificationType[mtype] if mtype in NotificationType.__members__ else None
+        return data
+
+
+class CircuitBreaker:
+    """
+    熔断器：连续失败达到阈值后熔断，冷却期内快速失败，冷却结束后放行一次探测请求
+    """
+    STATE_CLOSED = "closed"
+    STATE_OPEN = "open"
+    STATE_HALF_OPEN = "half_open"
+
+    def __init__(self, threshold: int = 5, cooldown: float = 60):
+        """
+        :param threshold: 触发熔断的连续失败次数
+        :param cooldown: 熔断冷却时间（秒）
+        """
+        self._threshold = max(1, threshold)
+        self._cooldown = cooldown
+        self._lock = threading.Lock()
+        self._state = self.STATE_CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probing = False
+        self._last_change = time.time()
+        # 状态转换计数
+        self._transitions: Dict[str, int] = defaultdict(int)
+        # 被熔断拦截的请求数
+        self._rejected = 0
+
+    @property
+    def state(self) -> str:
+        return self._state
+
+    def allow(self) -> bool:
+        """
+        是否允许发起请求
+        """
+        with self._lock:
+            if self._state == self.STATE_CLOSED:
+                return True
+            if self._state == self.STATE_OPEN and time.monotonic() - self._opened_at >= self._cooldown:
+                self.__transit(self.STATE_HALF_OPEN)
+            if self._state == self.STATE_HALF_OPEN and not self._probing:
+                # 半开状态只放行一个探测请求
+                self._probing = True
+                return True
+            self._rejected += 1
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._probing = False
+            if self._state != self.STATE_CLOSED:
+                self.__transit(self.STATE_CLOSED)
+
+    def release(self):
+        """
+        放行的请求未实际发出，归还探测名额，不改变状态与失败计数
+        """
+        with self._lock:
+            self._probing = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            self._probing = False
+            if self._state == self.STATE_HALF_OPEN \
+                    or (self._state == self.STATE_CLOSED and self._failures >= self._threshold):
+                self._opened_at = time.monotonic()
+                self.__transit(self.STATE_OPEN)
+
+    def snapshot(self) -> dict:
+        """
+        当前状态快照
+        """
+        with self._lock:
+            return {
+                "state": self._state,
+                "consecutive_failures": self._failures,
+                "threshold": self._threshold,
+                "cooldown": self._cooldown,
+                "cooldown_remaining": max(0.0, round(self._cooldown - (time.monotonic() - self._opened_at), 1))
+                if self._state == self.STATE_OPEN else 0,
+                "last_change": datetime.fromtimestamp(self._last_change).strftime("%Y-%m-%d %H:%M:%S"),
+                "rejected": self._rejected,
+                "transitions": dict(self._transitions)
+            }
+
+    def __transit(self, state: str):
+        self._transitions[f"{self._state}->{state}"] += 1
+        self._state = state
+        self._last_change = time.time()
+        logger.info(f"Gotify消息推送 熔断器状态变更为：{state}")
+
+
+class DedupCache:
+    """
+    重复消息抑制缓存：TTL + LRU，按 (类型, 标题, 内容) 的摘要去重，条目数有上限
+    """
+
+    def __init__(self, ttl: float = 300, max_entries: int = 1000, metrics: Optional["DeliveryMetrics"] = None):
+        """
+        :param ttl: 相同消息的抑制时间（秒）
+        :param max_entries: 最大缓存条目数
+        :param metrics: 推送指标，抑制计数同时累计到其中（跨缓存重建保留）
+        """
+        self._ttl = ttl
+        self._max_entries = max(1, max_entries)
+        # 摘要 -> [过期时间, 被抑制次数]
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        self._metrics = metrics
+        # 累计抑制次数
+        self.suppressed = 0
+
+    @staticmethod
+    def key(mtype: Optional[NotificationType], title: str, text: str) -> bytes:
+        digest = hashlib.blake2b(digest_size=16)
+        for part in (mtype.name if mtype else "", title or "", text or ""):
+            digest.update(part.encode("utf-8"))
+            digest.update(b"\x00")
+        return digest.digest()
+
+    def check(self, key: bytes) -> Tuple[bool, int]:
+        """
+        检查消息是否需要发送，返回 (是否发送, 上一窗口内被抑制的次数)
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[0] > now:
+                entry[1] += 1
+                self.suppressed += 1
+                self._entries.move_to_end(key)
+                if self._metrics:
+                    self._metrics.record_deduplicated()
+                return False, 0
+            folded = entry[1] if entry else 0
+            self._entries[key] = [now + self._ttl, 0]
+            self._entries.move_to_end(key)
+            # 淘汰最久未出现的条目
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+            return True, folded
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+@dataclass
+class GotifyTarget:
+    """
+    Gotify推送目标
+    """
+    # 名称
+    name: str
+    # 服务器地址
+    server: str
+    # 应用令牌
+    token: str
+    # 消息级别
+    priority: str = "0"
+    # 接收的消息类型（NotificationType.name），为空则接收全部
+    msgtypes: frozenset = frozenset()
+    # 熔断器
+    breaker: Optional[CircuitBreaker] = None
+
+    def accept(self, mtype: Optional[NotificationType]) -> bool:
+        return not mtype or not self.msgtypes or mtype.name in self.msgtypes
+
+
+class MessageTemplate:
+    """
+    预编译的消息模板，支持占位符 {title} {text} {type} {image} {link}，渲染结果写入Gotify的 extras
+    """
+    FIELDS = frozenset(("title", "text", "type", "image", "link"))
+
+    def __init__(self, title: str = "{title}", body: str = "{text}", markdown: bool = False,
+                 click: Optional[str] = None, image: bool = False, max_bytes: int = 0):
+        """
+        :param title: 标题模板
+        :param body: 内容模板
+        :param markdown: 内容是否按 Markdown 显示
+        :param click: 点击通知打开的链接模板
+        :param image: 是否将消息图片作为通知大图
+        :param max_bytes: 内容最大字节数，超出截断，0 为不限制
+        """
+        self._title = self.__compile(title)
+        self._body = self.__compile(body)
+        self._click = self.__compile(click) if click else None
+        self._image = image
+        self._max_bytes = max(0, max_bytes)
+        self._display = {"contentType": "text/markdown"} if markdown else None
+
+    @classmethod
+    def __compile(cls, fmt: str) -> Tuple[Tuple[str, Optional[str]], ...]:
+        """
+        解析模板为 (字面文本, 字段名) 片段，只在配置加载时执行一次
+        """
+        parts = []
+        for literal, field, _, _ in string.Formatter().parse(fmt):
+            if field is not None and field not in cls.FIELDS:
+                raise ValueError(f"不支持的模板占位符：{{{field}}}")
+            parts.append((literal, field))
+        return tuple(parts)
+
+    @staticmethod
+    def __fill(parts: Tuple[Tuple[str, Optional[str]], ...], values: dict) -> str:
+        return "".join(literal + (str(values.get(field) or "") if field else "") for literal, field in parts)
+
+    @staticmethod
+    def truncate(text: str, max_bytes: int) -> str:
+        """
+        按 UTF-8 字节数截断，不截断半个字符
+        """
+        if not max_bytes or len(text) * 4 <= max_bytes:
+            return text
+        encoded = text.encode("utf-8")
+        if len(encoded) <= max_bytes:
+            return text
+        return encoded[:max(0, max_bytes - 3)].decode("utf-8", "ignore") + "…"
+
+    def render(self, message: dict) -> dict:
+        """
+        渲染消息，返回包含 title、text、extras 的新消息
+        """
+        mtype: Optional[NotificationType] = message.get("mtype")
+        values = {
+            "title": message.get("title"),
+            "text": message.get("text"),
+            "type": mtype.value if mtype else "",
+            "image": message.get("image"),
+            "link": message.get("link")
+        }
+        extras = {}
+        if self._display:
+            extras["client::display"] = self._display
+        notification = {}
+        if self._click:
+            url = self.__fill(self._click, values)
+            if url:
+                notification["click"] = {"url": url}
+        if self._image and values["image"]:
+            notification["bigImageUrl"] = values["image"]
+        if notification:
+            extras["client::notification"] = notification
+        return {
+            **message,
+            "title": self.__fill(self._title, values),
+            "text": self.truncate(self.__fill(self._body, values), self._max_bytes),
+            "extras": extras
+        }
+
+
+class DeliveryMetrics:
+    """
+    推送指标：按状态码、消息类型计数，固定分桶的推送耗时直方图
+    """
+    # 耗时分桶上限（秒）
+    BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, float("inf"))
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._started = time.time()
+        # 状态码（无响应为 error）-> 次数
+        self._status: Dict[str, int] = defaultdict(int)
+        # (消息类型, 推送结果) -> 次数
+        self._mtypes: Dict[Tuple[str, str], int] = defaultdict(int)
+        self._buckets = [0] * len(self.BUCKETS)
+        self._count = 0
+        self._sum = 0.0
+        # 投递队列丢弃、去重抑制的消息数，队列与去重缓存随配置重建，计数保留在此
+        self._dropped = 0
+        self._deduplicated = 0
+
+    def observe(self, status: str, seconds: float):
+        """
+        记录一次HTTP推送
+        """
+        idx = bisect.bisect_left(self.BUCKETS, seconds)
+        with self._lock:
+            self._status[status] += 1
+            self._buckets[idx] += 1
+            self._count += 1
+            self._sum += seconds
+
+    def record(self, mtype: Optional[NotificationType], result: str):
+        """
+        记录一条消息的推送结果
+        """
+        with self._lock:
+            self._mtypes[(mtype.name if mtype else "None", result)] += 1
+
+    def record_dropped(self, num: int = 1):
+        """
+        记录投递队列丢弃的消息数
+        """
+        with self._lock:
+            self._dropped += num
+
+    def record_deduplicated(self, num: int = 1):
+        """
+        记录被去重抑制的消息数
+        """
+        with self._lock:
+            self._deduplicated += num
+
+    def quantile(self, q: float) -> float:
+        """
+        由直方图估算分位数（秒），桶内线性插值
+        """
+        with self._lock:
+            buckets = list(self._buckets)
+            count = self._count
+        if not count:
+            return 0.0
+        rank = q * count
+        cumulative = 0
+        for idx, num in enumerate(buckets):
+            if cumulative + num >= rank and num:
+                lower = self.BUCKETS[idx - 1] if idx else 0.0
+                upper = self.BUCKETS[idx]
+                if upper == float("inf"):
+                    return lower
+                return lower + (upper - lower) * (rank - cumulative) / num
+            cumulative += num
+        return self.BUCKETS[-2]
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            status = dict(self._status)
+            mtypes = defaultdict(dict)
+            for (mtype, result), num in self._mtypes.items():
+                mtypes[mtype][result] = num
+            count = self._count
+            total = self._sum
+            buckets = list(self._buckets)
+            dropped = self._dropped
+            deduplicated = self._deduplicated
+        return {
+            "since": datetime.fromtimestamp(self._started).strftime("%Y-%m-%d %H:%M:%S"),
+            "requests": count,
+            "dropped": dropped,
+            "deduplicated": deduplicated,
+            "status": status,
+            "mtypes": dict(mtypes),
+            "latency": {
+                "avg": round(total / count, 4) if count else 0,
+                "p50": round(self.quantile(0.5), 4),
+                "p95": round(self.quantile(0.95), 4),
+                "p99": round(self.quantile(0.99), 4),
+                "buckets": {("+Inf" if bound == float("inf") else str(bound)): num
+                            for bound, num in zip(self.BUCKETS, buckets)},
+                "sum": round(total, 4)
+            }
+        }
+
+
+class Route(NamedTuple):
+    """
+    消息类型的预编译路由
+    """
+    # 接收该类型消息的目标名称
+    targets: Tuple[str, ...]
+    # 入队条目：(目标名称, 队列优先级)，同时推送模式下每个目标一条，故障转移模式下合为一条
+    deliveries: Tuple[Tuple[Tuple[str, ...], int], ...]
+    # 消息模板
+    template: MessageTemplate
+
+
 class GotifyMsgPush(_PluginBase):
     # 插件名称
     plugin_name = "Gotify消息推送"
@@ -16,7 +918,7 @@ class GotifyMsgPush(_PluginBase):
     # 插件图标
     plugin_icon = "https://raw.githubusercontent.com/MidnightShake/MoviePilot-Plugins/master/icons/gotify-logo.png"
     # 插件版本
-    plugin_version = "2.2"
+    plugin_version = "3.3"
     # 插件作者
     plugin_author = "MidnightShake"
     # 作者主页
@@ -28,6 +930,19 @@ class GotifyMsgPush(_PluginBase):
     # 可使用的用户级别
     auth_level = 1
 
+    # 推送结果
+    DELIVER_OK = "ok"
+    DELIVER_RETRY = "retry"
+    DELIVER_LIMITED = "limited"
+    DELIVER_FAIL = "fail"
+    # 未发出请求即失败（消息为空、参数未配置），不反映服务器状态
+    DELIVER_INVALID = "invalid"
+    # 多目标推送模式
+    MODE_FANOUT = "fanout"
+    MODE_FAILOVER = "failover"
+    # 主服务器目标名称
+    PRIMARY_TARGET = "主服务器"
+
     # 私有属性
     _enabled = False
     _onlyonce = False
@@ -38,6 +953,51 @@ class GotifyMsgPush(_PluginBase):
     _params = None
     _diy_title = None
     _diy_message = None
+    _queue_size = 1000
+    _queue_workers = 2
+    _queue_policy = DeliveryQueue.POLICY_DROP_OLDEST
+    _pool_size = 4
+    _pool_idle_timeout = 60
+    _batch_enabled = False
+    _batch_window = 2000
+    _batch_max_items = 20
+    _batch_max_bytes = 4096
+    _retry_times = 3
+    _retry_delay = 2
+    _breaker_threshold = 5
+    _breaker_cooldown = 60
+    _rate_limit = 0
+    _rate_burst = 5
+    _priority_msgtypes = []
+    _dedup_enabled = False
+    _dedup_ttl = 300
+    _dedup_max = 1000
+    _dedup_fold = False
+    _extra_targets = ''
+    _target_mode = MODE_FANOUT
+    _templates = ''
+    _max_bytes = 4096
+    # 推送目标，主服务器在前
+    _targets: Mapping[str, GotifyTarget] = MappingProxyType({})
+    # 路由表：消息类型（None 为无类型消息）-> 路由，配置变更时重建
+    _routes: Mapping[Optional[NotificationType], Route] = MappingProxyType({})
+    # 投递队列
+    _queue: Optional[DeliveryQueue] = None
+    # 合并窗口
+    _coalescer: Optional[MessageCoalescer] = None
+    # 重试调度
+    _retry: Optional[RetryScheduler] = None
+    # 发件箱
+    _outbox: Optional[Outbox] = None
+    # 重复消息抑制
+    _dedup: Optional[DedupCache] = None
+    # 推送指标，插件重载配置时保留
+    _metrics: Optional[DeliveryMetrics] = None
+    # 连接池会话，按服务器地址区分
+    _sessions: Optional[Dict[str, Session]] = None
+    _session_last_used: Optional[Dict[str, float]] = None
+    _session_pool_size = None
+    _session_lock = threading.Lock()
 
     def init_plugin(self, config: dict = None):
         if config:
@@ -49,6 +1009,70 @@ class GotifyMsgPush(_PluginBase):
             self._priority = config.get("priority")
             self._diy_title = config.get("diy_title")
             self._diy_message = config.get("diy_message")
+            self._queue_size = self.__to_int(config.get("queue_size"), 1000)
+            self._queue_workers = self.__to_int(config.get("queue_workers"), 2)
+            self._queue_policy = config.get("queue_policy") or DeliveryQueue.POLICY_DROP_OLDEST
+            self._pool_size = self.__to_int(config.get("pool_size"), 4)
+            self._pool_idle_timeout = self.__to_int(config.get("pool_idle_timeout"), 60)
+            self._batch_enabled = config.get("batch_enabled")
+            self._batch_window = self.__to_int(config.get("batch_window"), 2000)
+            self._batch_max_items = self.__to_int(config.get("batch_max_items"), 20)
+            self._batch_max_bytes = self.__to_int(config.get("batch_max_bytes"), 4096)
+            self._retry_times = self.__to_int(config.get("retry_times"), 3, minimum=0)
+            self._retry_delay = self.__to_int(config.get("retry_delay"), 2)
+            self._breaker_threshold = self.__to_int(config.get("breaker_threshold"), 5)
+            self._breaker_cooldown = self.__to_int(config.get("breaker_cooldown"), 60)
+            self._rate_limit = self.__to_float(config.get("rate_limit"), 0)
+            self._rate_burst = self.__to_int(config.get("rate_burst"), 5)
+            self._priority_msgtypes = config.get("priority_msgtypes") or []
+            self._dedup_enabled = config.get("dedup_enabled")
+            self._dedup_ttl = self.__to_int(config.get("dedup_ttl"), 300)
+            self._dedup_max = self.__to_int(config.get("dedup_max"), 1000)
+            self._dedup_fold = config.get("dedup_fold")
+            self._extra_targets = config.get("extra_targets") or ''
+            self._target_mode = config.get("target_mode") or self.MODE_FANOUT
+            self._templates = config.get("templates") or ''
+            self._max_bytes = self.__to_int(config.get("max_bytes"), 4096, minimum=0)
+            if self._metrics is None:
+                self._metrics = DeliveryMetrics()
+            self._targets = self.__build_targets()
+            self._routes = self.__build_routes()
+
+            # 连接池按实例持有，服务器地址变更时才关闭对应连接池，连接池大小变更时全部重建
+            if self._sessions is None:
+                self._sessions = {}
+                self._session_last_used = {}
+            if self._pool_size != self._session_pool_size:
+                self.__close_sessions()
+                self._session_pool_size = self._pool_size
+            else:
+                self.__close_sessions(keep={target.server for target in self._targets.values()})
+
+            # 重建投递队列
+            self.__stop_queue()
+            self._queue = DeliveryQueue(handler=self.__deliver,
+                                        maxsize=self._queue_size,
+                                        # 保证每个目标都有可用的投递线程，总耗时取决于最慢的目标
+                                        workers=max(self._queue_workers, len(self._targets)),
+                                        policy=self._queue_policy,
+                                        limiter=TokenBucket(rate=self._rate_limit, burst=self._rate_burst),
+                                        metrics=self._metrics)
+            self._dedup = DedupCache(ttl=self._dedup_ttl, max_entries=self._dedup_max,
+                                     metrics=self._metrics) if self._dedup_enabled else None
+            self._queue.start()
+            self._retry = RetryScheduler(submit=self.__enqueue, base_delay=self._retry_delay)
+            self._retry.start()
+            self._outbox = Outbox(path=self.get_data_path() / "outbox.jsonl")
+            if len(self._outbox):
+                # 补发上次未成功推送的消息
+                for item in self._outbox.drain():
+                    item["attempt"] = 0
+                    self.__enqueue(item)
+            if self._batch_enabled:
+                self._coalescer = MessageCoalescer(flush=self.__dispatch,
+                                                   window_ms=self._batch_window,
+                                                   max_items=self._batch_max_items,
+                                                   max_bytes=self._batch_max_bytes)
 
             if self._onlyonce:
                 logger.info(f"Gotify消息推送服务启动,立即向服务器发送一次 自定义消息")
@@ -76,14 +1100,206 @@ class GotifyMsgPush(_PluginBase):
 
 
     def get_state(self) -> bool:
-        return self._enabled and (True if self._server and self._apikey else False)
+        return self._enabled and (True if self._targets else False)
+
+    def __build_routes(self) -> Mapping[Optional[NotificationType], Route]:
+        """
+        预编译各消息类型的路由，推送时只需一次字典查找
+        """
+        priority_msgtypes = frozenset(self._priority_msgtypes)
+        templates = self.__build_templates()
+        default_template = templates.get(None) or MessageTemplate(max_bytes=self._max_bytes)
+        routes = {}
+        for mtype in [None, *NotificationType]:
+            targets = [target for target in self._targets.values() if target.accept(mtype)]
+            if not targets:
+                continue
+            # 选定的消息类型额外提升队列优先级
+            boost = 100 if mtype and mtype.name in priority_msgtypes else 0
+            ranks = [self.__to_int(target.priority, 0, minimum=0) + boost for target in targets]
+            if self._target_mode == self.MODE_FANOUT:
+                deliveries = tuple(((target.name,), rank) for target, rank in zip(targets, ranks))
+            else:
+                deliveries = ((tuple(target.name for target in targets), max(ranks)),)
+            routes[mtype] = Route(targets=tuple(target.name for target in targets),
+                                  deliveries=deliveries,
+                                  template=templates.get(mtype) or default_template)
+        return MappingProxyType(routes)
+
+    def __build_templates(self) -> Dict[Optional[NotificationType], MessageTemplate]:
+        """
+        解析并预编译消息模板配置，键为消息类型名称或显示值，default 为默认模板
+        """
+        templates = {}
+        if not self._templates.strip():
+            return templates
+        try:
+            config = json.loads(self._templates)
+        except Exception as err:
+            logger.error(f"Gotify消息推送 消息模板不是有效的JSON：{err}")
+            return templates
+        mtypes = {}
+        for item in NotificationType:
+            mtypes[item.name] = item
+            mtypes[item.value] = item
+        for key, conf in config.items():
+            if key != "default" and key not in mtypes:
+                logger.warn(f"Gotify消息推送 消息模板的消息类型不存在：{key}")
+                continue
+            try:
+                templates[mtypes.get(key)] = MessageTemplate(title=conf.get("title") or "{title}",
+                                                             body=conf.get("body") or "{text}",
+                                                             markdown=bool(conf.get("markdown")),
+                                                             click=conf.get("click"),
+                                                             image=bool(conf.get("image")),
+                                                             max_bytes=self._max_bytes)
+            except Exception as err:
+                logger.error(f"Gotify消息推送 消息模板 {key} 配置错误：{err}")
+        return templates
+
+    def __build_targets(self) -> Mapping[str, GotifyTarget]:
+        """
+        根据配置生成推送目标：主服务器 + 额外目标（每行 名称|服务器地址|令牌|消息级别|消息类型）
+        """
+        targets: Dict[str, GotifyTarget] = {}
+        if self._server and self._apikey:
+            targets[self.PRIMARY_TARGET] = GotifyTarget(name=self.PRIMARY_TARGET,
+                                                        server=self._server,
+                                                        token=self._apikey,
+                                                        priority=self._priority,
+                                                        msgtypes=frozenset(self._msgtypes))
+        # 消息类型可填写名称或显示值
+        mtype_names = {}
+        for item in NotificationType:
+            mtype_names[item.name] = item.name
+            mtype_names[item.value] = item.name
+        for idx, line in enumerate(self._extra_targets.splitlines(), start=1):
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            parts = [part.strip() for part in line.split("|")]
+            if len(parts) < 3 or not parts[1] or not parts[2]:
+                logger.warn(f"Gotify消息推送 额外推送目标第 {idx} 行格式错误：{line}")
+                continue
+            name = parts[0] or f"目标{idx}"
+            msgtypes = frozenset(mtype_names[mtype.strip()]
+                                 for mtype in (parts[4] if len(parts) > 4 else "").split(",")
+                                 if mtype.strip() in mtype_names)
+            targets[name] = GotifyTarget(name=name,
+                                         server=parts[1].rstrip("/"),
+                                         token=parts[2],
+                                         priority=parts[3] if len(parts) > 3 and parts[3] else "0",
+                                         msgtypes=msgtypes)
+        for target in targets.values():
+            target.breaker = CircuitBreaker(threshold=self._breaker_threshold, cooldown=self._breaker_cooldown)
+        return MappingProxyType(targets)
+
+    @staticmethod
+    def __to_int(value: Any, default: int, minimum: int = 1) -> int:
+        """
+        将表单中的文本配置转换为整数
+        """
+        try:
+            return max(minimum, int(value))
+        except (TypeError, ValueError):
+            return default
+
+    @staticmethod
+    def __to_float(value: Any, default: float, minimum: float = 0) -> float:
+        """
+        将表单中的文本配置转换为浮点数
+        """
+        try:
+            return max(minimum, float(value))
+        except (TypeError, ValueError):
+            return default
 
     @staticmethod
     def get_command() -> List[Dict[str, Any]]:
         pass
 
     def get_api(self) -> List[Dict[str, Any]]:
-        pass
+        return [
+            {
+                "path": "/breaker",
+                "endpoint": self.breaker_state,
+                "methods": ["GET"],
+                "summary": "熔断器状态",
+                "description": "查看各Gotify推送目标熔断器的当前状态及状态转换次数",
+                "auth": "bear"
+            },
+            {
+                "path": "/metrics",
+                "endpoint": self.metrics,
+                "methods": ["GET"],
+                "summary": "推送指标",
+                "description": "查看按状态码、消息类型统计的推送次数，推送耗时分位数及队列状态",
+                "auth": "bear"
+            },
+            {
+                "path": "/metrics/prometheus",
+                "endpoint": self.metrics_prometheus,
+                "methods": ["GET"],
+                "summary": "推送指标（Prometheus格式）",
+                "description": "以Prometheus文本格式输出推送指标",
+                "auth": "apikey"
+            }
+        ]
+
+    def metrics(self) -> Dict[str, Any]:
+        """
+        推送指标
+        """
+        data = self._metrics.snapshot() if self._metrics else {}
+        data.update({
+            "queue_depth": self._queue.qsize() if self._queue else 0,
+            "retry_pending": self._retry.pending() if self._retry else 0,
+            **self.breaker_state()
+        })
+        return data
+
+    def metrics_prometheus(self) -> PlainTextResponse:
+        """
+        Prometheus文本格式的推送指标
+        """
+        data = self.metrics()
+        lines = ["# TYPE gotifymsgpush_requests_total counter"]
+        for status, num in (data.get("status") or {}).items():
+            lines.append(f'gotifymsgpush_requests_total{{status="{status}"}} {num}')
+        lines.append("# TYPE gotifymsgpush_messages_total counter")
+        for mtype, results in (data.get("mtypes") or {}).items():
+            for result, num in results.items():
+                lines.append(f'gotifymsgpush_messages_total{{mtype="{mtype}",result="{result}"}} {num}')
+        latency = data.get("latency")
+        if latency:
+            lines.append("# TYPE gotifymsgpush_request_duration_seconds histogram")
+            cumulative = 0
+            for bound, num in latency["buckets"].items():
+                cumulative += num
+                lines.append(f'gotifymsgpush_request_duration_seconds_bucket{{le="{bound}"}} {cumulative}')
+            lines.append(f"gotifymsgpush_request_duration_seconds_sum {latency['sum']}")
+            lines.append(f"gotifymsgpush_request_duration_seconds_count {data.get('requests', 0)}")
+        for name in ("queue_depth", "retry_pending", "outbox"):
+            lines.append(f"# TYPE gotifymsgpush_{name} gauge")
+            lines.append(f"gotifymsgpush_{name} {data.get(name, 0)}")
+        for name in ("dropped", "deduplicated"):
+            lines.append(f"# TYPE gotifymsgpush_{name}_total counter")
+            lines.append(f"gotifymsgpush_{name}_total {data.get(name, 0)}")
+        lines.append("# TYPE gotifymsgpush_breaker_open gauge")
+        for target, breaker in (data.get("breakers") or {}).items():
+            lines.append(f'gotifymsgpush_breaker_open{{target="{target}"}} '
+                         f'{0 if breaker["state"] == CircuitBreaker.STATE_CLOSED else 1}')
+        return PlainTextResponse("\n".join(lines) + "\n")
+
+    def breaker_state(self) -> Dict[str, Any]:
+        """
+        熔断器状态
+        """
+        return {
+            "breakers": {name: target.breaker.snapshot()
+                         for name, target in self._targets.items() if target.breaker},
+            "outbox": len(self._outbox) if self._outbox is not None else 0
+        }
 
     def get_form(self) -> Tuple[List[dict], Dict[str, Any]]:
         """
@@ -207,14 +1423,16 @@ class GotifyMsgPush(_PluginBase):
                                 'component': 'VCol',
                                 'props': {
                                     'cols': 12,
-                                    'md': 6
+                                    'md': 8
                                 },
                                 'content': [
                                     {
-                                        'component': 'VSwitch',
+                                        'component': 'VTextarea',
                                         'props': {
-                                            'model': 'onlyonce',
-                                            'label': '立即发送一次 自定义消息',
+                                            'model': 'extra_targets',
+                                            'label': '额外推送目标',
+                                            'rows': 3,
+                                            'placeholder': '每行一个：名称|服务器地址|令牌|消息级别|消息类型(逗号分隔，留空为全部)',
                                         }
                                     }
                                 ]
@@ -222,15 +1440,42 @@ class GotifyMsgPush(_PluginBase):
                             {
                                 'component': 'VCol',
                                 'props': {
-                                    'cols': 12
+                                    'cols': 12,
+                                    'md': 4
                                 },
                                 'content': [
                                     {
-                                        'component': 'VTextField',
+                                        'component': 'VSelect',
                                         'props': {
-                                            'model': 'diy_title',
-                                            'label': '输入自定义消息的 标题',
-                                            'placeholder': '(不能留空)',
+                                            'model': 'target_mode',
+                                            'label': '多目标推送模式',
+                                            'items': [
+                                                {'title': '同时推送到所有目标', 'value': self.MODE_FANOUT},
+                                                {'title': '故障转移(前一个失败才推送下一个)', 'value': self.MODE_FAILOVER}
+                                            ]
+                                        }
+                                    }
+                                ]
+                            }
+                        ]
+                    },
+                    {
+                        'component': 'VRow',
+                        'content': [
+                            {
+                                'component': 'VCol',
+                                'props': {
+                                    'cols': 12,
+                                    'md': 8
+                                },
+                                'content': [
+                                    {
+                                        'component': 'VTextarea',
+                                        'props': {
+                                            'model': 'templates',
+                                            'label': '消息模板(JSON)',
+                                            'rows': 3,
+                                            'placeholder': '{"资源下载": {"title": "{type}：{title}", "body": "{text}", "markdown": false, "click": "{link}", "image": true}, "default": {"title": "{title}"}}',
                                         }
                                     }
                                 ]
@@ -238,21 +1483,474 @@ class GotifyMsgPush(_PluginBase):
                             {
                                 'component': 'VCol',
                                 'props': {
-                                    'cols': 12
+                                    'cols': 12,
+                                    'md': 4
                                 },
                                 'content': [
                                     {
                                         'component': 'VTextField',
                                         'props': {
-                                            'model': 'diy_message',
-                                            'label': '输入自定义消息的 内容',
-                                            'placeholder': '(不能留空)',
+                                            'model': 'max_bytes',
+                                            'label': '消息内容最大字节数',
+                                            'placeholder': '留空则默认为4096，0为不限制',
                                         }
                                     }
                                 ]
                             }
                         ]
-                    }
+                    },
+                    {
+                        'component': 'VRow',
+                        'content': [
+                            {
+                                'component': 'VCol',
+                                'props': {
+                                    'cols': 12,
+                                    'md': 6
+                                },
+                                'content': [
+                                    {
+                                        'component': 'VSwitch',
+                                        'props': {
+                                            'model': 'onlyonce',
+                                            'label': '立即发送一次 自定义消息',
+                                        }
+                                    }
+                                ]
+                            },
+                            {
+                                'component': 'VCol',
+                                'props': {
+                                    'cols': 12
+                                },
+                                'content': [
+                                    {
+                                        'component': 'VTextField',
+                                        'props': {
+                                            'model': 'diy_title',
+                                            'label': '输入自定义消息的 标题',
+                                            'placeholder': '(不能留空)',
+                                        }
+                                    }
+                                ]
+                            },
+                            {
+                                'component': 'VCol',
+                                'props': {
+                                    'cols': 12
+                                },
+                                'content': [
+                                    {
+                                        'component': 'VTextField',
+                                        'props': {
+                                            'model': 'diy_message',
+                                            'label': '输入自定义消息的 内容',
+                                            'placeholder': '(不能留空)',
+                                        }
+                                    }
+                                ]
+                            }
+                        ]
+                    },
+                    {
+                        'component': 'VRow',
+                        'content': [
+                            {
+                                'component': 'VCol',
+                                'props': {
+                                    'cols': 12,
+                                    'md': 4
+                                },
+                                'content': [
+                                    {
+                                        'component': 'VTextField',
+                                        'props': {
+                                            'model': 'queue_size',
+                                            'label': '投递队列深度',
+                                            'placeholder': '留空则默认为1000',
+                                        }
+                                    }
+                                ]
+                            },
+                            {
+                                'component': 'VCol',
+                                'props': {
+                                    'cols': 12,
+                                    'md': 4
+                                },
+                                'content': [
+                                    {
+                                        'component': 'VTextField',
+                                        'props': {
+                                            'model': 'queue_workers',
+                                            'label': '投递线程数',
+                                            'placeholder': '留空则默认为2',
+                                        }
+                                    }
+                                ]
+                            },
+                            {
+                                'component': 'VCol',
+                                'props': {
+                                    'cols': 12,
+                                    'md': 4
+                                },
+                                'content': [
+                                    {
+                                        'component': 'VSelect',
+                                        'props': {
+                                            'model': 'queue_policy',
+                                            'label': '队列满时的处理策略',
+                                            'items': [
+                                                {'title': '丢弃最早的消息', 'value': DeliveryQueue.POLICY_DROP_OLDEST},
+                                                {'title': '丢弃最新的消息', 'value': DeliveryQueue.POLICY_DROP_NEWEST},
+                                                {'title': '等待(最多5秒)', 'value': DeliveryQueue.POLICY_BLOCK}
+                                            ]
+                                        }
+                                    }
+                                ]
+                            }
+                        ]
+                    },
+                    {
+                        'component': 'VRow',
+                        'content': [
+                            {
+                                'component': 'VCol',
+                                'props': {
+                                    'cols': 12,
+                                    'md': 6
+                                },
+                                'content': [
+                                    {
+                                        'component': 'VTextField',
+                                        'props': {
+                                            'model': 'pool_size',
+                                            'label': '连接池大小',
+                                            'placeholder': '留空则默认为4',
+                                        }
+                                    }
+                                ]
+                            },
+                            {
+                                'component': 'VCol',
+                                'props': {
+                                    'cols': 12,
+                                    'md': 6
+                                },
+                                'content': [
+                                    {
+                                        'component': 'VTextField',
+                                        'props': {
+                                            'model': 'pool_idle_timeout',
+                                            'label': '连接空闲超时(秒)',
+                                            'placeholder': '留空则默认为60',
+                                        }
+                                    }
+                                ]
+                            }
+                        ]
+                    },
+                    {
+                        'component': 'VRow',
+                        'content': [
+                            {
+                                'component': 'VCol',
+                                'props': {
+                                    'cols': 12,
+                                    'md': 3
+                                },
+                                'content': [
+                                    {
+                                        'component': 'VSwitch',
+                                        'props': {
+                                            'model': 'batch_enabled',
+                                            'label': '合并同类型突发消息',
+                                        }
+                                    }
+                                ]
+                            },
+                            {
+                                'component': 'VCol',
+                                'props': {
+                                    'cols': 12,
+                                    'md': 3
+                                },
+                                'content': [
+                                    {
+                                        'component': 'VTextField',
+                                        'props': {
+                                            'model': 'batch_window',
+                                            'label': '合并窗口(毫秒)',
+                                            'placeholder': '留空则默认为2000',
+                                        }
+                                    }
+                                ]
+                            },
+                            {
+                                'component': 'VCol',
+                                'props': {
+                                    'cols': 12,
+                                    'md': 3
+                                },
+                                'content': [
+                                    {
+                                        'component': 'VTextField',
+                                        'props': {
+                                            'model': 'batch_max_items',
+                                            'label': '单条摘要最多消息数',
+                                            'placeholder': '留空则默认为20',
+                                        }
+                                    }
+                                ]
+                            },
+                            {
+                                'component': 'VCol',
+                                'props': {
+                                    'cols': 12,
+                                    'md': 3
+                                },
+                                'content': [
+                                    {
+                                        'component': 'VTextField',
+                                        'props': {
+                                            'model': 'batch_max_bytes',
+                                            'label': '单条摘要最大字节数',
+                                            'placeholder': '留空则默认为4096',
+                                        }
+                                    }
+                                ]
+                            }
+                        ]
+                    },
+                    {
+                        'component': 'VRow',
+                        'content': [
+                            {
+                                'component': 'VCol',
+                                'props': {
+                                    'cols': 12,
+                                    'md': 6
+                                },
+                                'content': [
+                                    {
+                                        'component': 'VTextField',
+                                        'props': {
+                                            'model': 'retry_times',
+                                            'label': '失败重试次数',
+                                            'placeholder': '留空则默认为3，0为不重试',
+                                        }
+                                    }
+                                ]
+                            },
+                            {
+                                'component': 'VCol',
+                                'props': {
+                                    'cols': 12,
+                                    'md': 6
+                                },
+                                'content': [
+                                    {
+                                        'component': 'VTextField',
+                                        'props': {
+                                            'model': 'retry_delay',
+                                            'label': '首次重试延迟(秒)',
+                                            'placeholder': '留空则默认为2，之后按指数退避',
+                                        }
+                                    }
+                                ]
+                            }
+                        ]
+                    },
+                    {
+                        'component': 'VRow',
+                        'content': [
+                            {
+                                'component': 'VCol',
+                                'props': {
+                                    'cols': 12,
+                                    'md': 6
+                                },
+                                'content': [
+                                    {
+                                        'component': 'VTextField',
+                                        'props': {
+                                            'model': 'breaker_threshold',
+                                            'label': '连续失败熔断阈值',
+                                            'placeholder': '留空则默认为5',
+                                        }
+                                    }
+                                ]
+                            },
+                            {
+                                'component': 'VCol',
+                                'props': {
+                                    'cols': 12,
+                                    'md': 6
+                                },
+                                'content': [
+                                    {
+                                        'component': 'VTextField',
+                                        'props': {
+                                            'model': 'breaker_cooldown',
+                                            'label': '熔断冷却时间(秒)',
+                                            'placeholder': '留空则默认为60',
+                                        }
+                                    }
+                                ]
+                            }
+                        ]
+                    },
+                    {
+                        'component': 'VRow',
+                        'content': [
+                            {
+                                'component': 'VCol',
+                                'props': {
+                                    'cols': 12,
+                                    'md': 3
+                                },
+                                'content': [
+                                    {
+                                        'component': 'VTextField',
+                                        'props': {
+                                            'model': 'rate_limit',
+                                            'label': '限速(条/秒)',
+                                            'placeholder': '留空或0则不限速',
+                                        }
+                                    }
+                                ]
+                            },
+                            {
+                                'component': 'VCol',
+                                'props': {
+                                    'cols': 12,
+                                    'md': 3
+                                },
+                                'content': [
+                                    {
+                                        'component': 'VTextField',
+                                        'props': {
+                                            'model': 'rate_burst',
+                                            'label': '允许突发条数',
+                                            'placeholder': '留空则默认为5',
+                                        }
+                                    }
+                                ]
+                            },
+                            {
+                                'component': 'VCol',
+                                'props': {
+                                    'cols': 12,
+                                    'md': 6
+                                },
+                                'content': [
+                                    {
+                                        'component': 'VSelect',
+                                        'props': {
+                                            'multiple': True,
+                                            'chips': True,
+                                            'model': 'priority_msgtypes',
+                                            'label': '优先发送的消息类型',
+                                            'items': MsgTypeOptions
+                                        }
+                                    }
+                                ]
+                            }
+                        ]
+                    },
+                    {
+                        'component': 'VRow',
+                        'content': [
+                            {
+                                'component': 'VCol',
+                                'props': {
+                                    'cols': 12,
+                                    'md': 3
+                                },
+                                'content': [
+                                    {
+                                        'component': 'VSwitch',
+                                        'props': {
+                                            'model': 'dedup_enabled',
+                                            'label': '抑制重复消息',
+                                        }
+                                    }
+                                ]
+                            },
+                            {
+                                'component': 'VCol',
+                                'props': {
+                                    'cols': 12,
+                                    'md': 3
+                                },
+                                'content': [
+                                    {
+                                        'component': 'VSwitch',
+                                        'props': {
+                                            'model': 'dedup_fold',
+                                            'label': '下次发送时附带重复次数',
+                                        }
+                                    }
+                                ]
+                            },
+                            {
+                                'component': 'VCol',
+                                'props': {
+                                    'cols': 12,
+                                    'md': 3
+                                },
+                                'content': [
+                                    {
+                                        'component': 'VTextField',
+                                        'props': {
+                                            'model': 'dedup_ttl',
+                                            'label': '重复消息抑制时间(秒)',
+                                            'placeholder': '留空则默认为300',
+                                        }
+                                    }
+                                ]
+                            },
+                            {
+                                'component': 'VCol',
+                                'props': {
+                                    'cols': 12,
+                                    'md': 3
+                                },
+                                'content': [
+                                    {
+                                        'component': 'VTextField',
+                                        'props': {
+                                            'model': 'dedup_max',
+                                            'label': '去重缓存最大条目数',
+                                            'placeholder': '留空则默认为1000',
+                                        }
+                                    }
+                                ]
+                            }
+                        ]
+                    },
+                    {
+                        'component': 'VRow',
+                        'content': [
+                            {
+                                'component': 'VCol',
+                                'props': {
+                                    'cols': 12,
+                                },
+                                'content': [
+                                    {
+                                        'component': 'VAlert',
+                                        'props': {
+                                            'type': 'info',
+                                            'variant': 'tonal',
+                                            'text': '服务器错误、超时、连接失败等临时错误会按指数退避自动重试，重试耗尽的消息暂存到本地发件箱，服务器恢复后自动补发；消息格式错误、令牌无效等错误不会重试。连续失败达到熔断阈值后，冷却时间内的消息直接存入发件箱，不再等待连接超时。开启限速后，消息级别高的消息及优先发送的消息类型会优先发送，队列满时优先丢弃低级别消息。消息模板可用占位符：{title} {text} {type} {image} {link}。'
+                                        }
+                                    }
+                                ]
+                            }
+                        ]
+                    }
                 ]
             }
         ], {
@@ -264,10 +1962,150 @@ class GotifyMsgPush(_PluginBase):
             'priority': '0',
             'diy_title': '',
             'diy_message': '',
+            'queue_size': '1000',
+            'queue_workers': '2',
+            'queue_policy': DeliveryQueue.POLICY_DROP_OLDEST,
+            'pool_size': '4',
+            'pool_idle_timeout': '60',
+            'batch_enabled': False,
+            'batch_window': '2000',
+            'batch_max_items': '20',
+            'batch_max_bytes': '4096',
+            'retry_times': '3',
+            'retry_delay': '2',
+            'breaker_threshold': '5',
+            'breaker_cooldown': '60',
+            'rate_limit': '0',
+            'rate_burst': '5',
+            'priority_msgtypes': [],
+            'dedup_enabled': False,
+            'dedup_fold': False,
+            'dedup_ttl': '300',
+            'dedup_max': '1000',
+            'extra_targets': '',
+            'target_mode': self.MODE_FANOUT,
+            'templates': '',
+            'max_bytes': '4096',
         }
 
     def get_page(self) -> List[dict]:
-        pass
+        """
+        拼装插件详情页面，需要返回页面配置，同时附带数据
+        """
+        data = self.metrics()
+        latency = data.get("latency") or {}
+        summary = [
+            ("推送请求数", data.get("requests", 0)),
+            ("耗时 P50/P95/P99(毫秒)", "/".join(str(round(latency.get(key, 0) * 1000))
+                                             for key in ("p50", "p95", "p99"))),
+            ("队列深度", data.get("queue_depth", 0)),
+            ("等待重试", data.get("retry_pending", 0)),
+            ("发件箱", data.get("outbox", 0)),
+            ("已丢弃", data.get("dropped", 0)),
+            ("已去重", data.get("deduplicated", 0)),
+        ]
+        status_rows = [[status, num] for status, num in sorted((data.get("status") or {}).items())]
+        mtype_names = {item.name: item.value for item in NotificationType}
+        mtype_rows = [[mtype_names.get(mtype, mtype),
+                       results.get(self.DELIVER_OK, 0),
+                       sum(num for result, num in results.items() if result != self.DELIVER_OK)]
+                      for mtype, results in sorted((data.get("mtypes") or {}).items())]
+        breaker_rows = [[target, breaker["state"], breaker["consecutive_failures"], breaker["rejected"]]
+                        for target, breaker in (data.get("breakers") or {}).items()]
+        return [
+            {
+                'component': 'VRow',
+                'content': [
+                    {
+                        'component': 'VCol',
+                        'props': {
+                            'cols': 12,
+                            'md': 3
+                        },
+                        'content': [
+                            {
+                                'component': 'VCard',
+                                'props': {
+                                    'variant': 'tonal'
+                                },
+                                'content': [
+                                    {
+                                        'component': 'VCardText',
+                                        'text': f"{title}：{value}"
+                                    }
+                                ]
+                            }
+                        ]
+                    } for title, value in summary
+                ]
+            },
+            self.__page_table(f"按状态码统计（自 {data.get('since', '')} 起）", ["状态码", "次数"], status_rows),
+            self.__page_table("按消息类型统计", ["消息类型", "成功", "失败"], mtype_rows),
+            self.__page_table("熔断器", ["推送目标", "状态", "连续失败", "已拦截"], breaker_rows)
+        ]
+
+    @staticmethod
+    def __page_table(title: str, headers: List[str], rows: List[list]) -> dict:
+        """
+        详情页表格
+        """
+        return {
+            'component': 'VRow',
+            'content': [
+                {
+                    'component': 'VCol',
+                    'props': {
+                        'cols': 12
+                    },
+                    'content': [
+                        {
+                            'component': 'div',
+                            'props': {
+                                'class': 'text-subtitle-1 mt-2'
+                            },
+                            'text': title
+                        },
+                        {
+                            'component': 'VTable',
+                            'props': {
+                                'hover': True
+                            },
+                            'content': [
+                                {
+                                    'component': 'thead',
+                                    'content': [
+                                        {
+                                            'component': 'th',
+                                            'props': {
+                                                'class': 'text-start ps-4'
+                                            },
+                                            'text': header
+                                        } for header in headers
+                                    ]
+                                },
+                                {
+                                    'component': 'tbody',
+                                    'content': [
+                                        {
+                                            'component': 'tr',
+                                            'content': [
+                                                {
+                                                    'component': 'td',
+                                                    'props': {
+                                                        'class': 'ps-4'
+                                                    },
+                                                    'text': str(cell)
+                                                } for cell in row
+                                            ]
+                                        } for row in rows
+                                    ]
+                                }
+                            ]
+                        }
+                    ]
+                }
+            ]
+        }
 
     def __update_config(self):
         self.update_config({
@@ -278,7 +2116,31 @@ class GotifyMsgPush(_PluginBase):
             "apikey": self._apikey,
             "priority": self._priority,
             "diy_title": '',
-            "diy_message": ''
+            "diy_message": '',
+            "queue_size": self._queue_size,
+            "queue_workers": self._queue_workers,
+            "queue_policy": self._queue_policy,
+            "pool_size": self._pool_size,
+            "pool_idle_timeout": self._pool_idle_timeout,
+            "batch_enabled": self._batch_enabled,
+            "batch_window": self._batch_window,
+            "batch_max_items": self._batch_max_items,
+            "batch_max_bytes": self._batch_max_bytes,
+            "retry_times": self._retry_times,
+            "retry_delay": self._retry_delay,
+            "breaker_threshold": self._breaker_threshold,
+            "breaker_cooldown": self._breaker_cooldown,
+            "rate_limit": self._rate_limit,
+            "rate_burst": self._rate_burst,
+            "priority_msgtypes": self._priority_msgtypes,
+            "dedup_enabled": self._dedup_enabled,
+            "dedup_fold": self._dedup_fold,
+            "dedup_ttl": self._dedup_ttl,
+            "dedup_max": self._dedup_max,
+            "extra_targets": self._extra_targets,
+            "target_mode": self._target_mode,
+            "templates": self._templates,
+            "max_bytes": self._max_bytes
         })
 
     @eventmanager.register(EventType.NoticeMessage)
@@ -286,6 +2148,7 @@ class GotifyMsgPush(_PluginBase):
         """
         消息发送事件
         """
+        msg_type = None
         if self._diy_title and self._diy_message:
             logger.info(f"Gotify消息推送服务检测到一次 测试消息待发送...")
             # 标题
@@ -311,50 +2174,234 @@ class GotifyMsgPush(_PluginBase):
             title = msg_body.get("title")
             # 文本
             text = msg_body.get("text")
-            if (text is not None or text != "") and (title is None or title == ""):
-                title = text
-            elif (text is None or text == "") and (title is not None or title != ""):
-                text = title
+            # 标题、文本互为缺省
+            title, text = title or text, text or title
 
-            if (msg_type and self._msgtypes
-                    and msg_type.name not in self._msgtypes):
+        route = self._routes.get(msg_type)
+        if not route:
+            if msg_type:
                 logger.info(f"消息类型 {msg_type.value} 在Gotify推送插件中 未开启")
+            return
+
+        if msg_type and self._dedup is not None:
+            # 抑制时间内重复的消息不再推送
+            need_send, folded = self._dedup.check(DedupCache.key(msg_type, title, text))
+            if not need_send:
+                logger.info(f"Gotify消息推送 重复消息已抑制：{title}")
+                return
+            if folded and self._dedup_fold:
+                title = f"{title} (×{folded + 1})"
+
+        message = {
+            "mtype": msg_type,
+            "title": title,
+            "text": text
+        }
+        if msg_type:
+            message["image"] = msg_body.get("image")
+            message["link"] = msg_body.get("link")
+        if msg_type and self._coalescer:
+            # 突发的同类型消息先进入合并窗口
+            if self._coalescer.add(msg_type.name, message):
+                return
+        self.__dispatch(message, route)
+
+    def __dispatch(self, message: dict, route: Optional[Route] = None):
+        """
+        按路由表渲染模板并拆分入队：同时推送模式下每个目标单独入队，由不同的投递线程并发发送
+        """
+        route = route or self._routes.get(message.get("mtype"))
+        if not route:
+            return
+        message = route.template.render(message)
+        for targets, rank in route.deliveries:
+            self.__enqueue({**message, "targets": targets, "rank": rank})
+
+    def __enqueue(self, message: dict):
+        """
+        投递消息到发送队列
+        """
+        if self._queue and self._queue.running:
+            # 仅入队，由后台线程推送，不阻塞事件分发
+            if not self._queue.put(message, priority=message.get("rank", 0)):
+                logger.warn(f"Gotify消息推送 投递队列已满，消息被丢弃：{message.get('title')}")
+        else:
+            self.__deliver(message)
+
+    def __deliver(self, message: dict):
+        """
+        推送消息，故障转移模式下依次尝试各目标，临时错误按退避重试，重试耗尽后存入发件箱
+        """
+        targets = [self._targets[name] for name in message.get("targets") or [] if name in self._targets]
+        if not targets:
+            # 目标已被删除（如发件箱中的旧消息），按当前路由表重新匹配
+            route = self._routes.get(message.get("mtype"))
+            targets = [self._targets[name] for name in route.targets] if route else []
+        retryable = False
+        diverted = False
+        for target in targets:
+            breaker = target.breaker
+            if breaker and not breaker.allow():
+                # 熔断中，不再等待连接超时
+                diverted = True
+                continue
+            result = self.__post(message, target)
+            if self._metrics:
+                self._metrics.record(message.get("mtype"), result)
+            if breaker:
+                # 服务器可达（包括 4xx 错误）即视为成功
+                if result == self.DELIVER_RETRY:
+                    breaker.record_failure()
+                elif result == self.DELIVER_INVALID:
+                    # 未访问服务器，仅归还半开状态的探测名额
+                    breaker.release()
+                else:
+                    breaker.record_success()
+            if result == self.DELIVER_OK:
+                # 服务器可用，补发发件箱中属于该目标的消息
+                if self._outbox is not None and self._outbox.pending(target.name):
+                    messages = self._outbox.drain(
+                        accept=lambda item: target.name in (item.get("targets") or [target.name]))
+                    if messages:
+                        logger.info(f"Gotify消息推送 服务器已恢复，补发发件箱中的 {len(messages)} 条消息")
+                    for item in messages:
+                        item["attempt"] = 0
+                        self.__enqueue(item)
                 return
+            if result in (self.DELIVER_RETRY, self.DELIVER_LIMITED):
+                retryable = True
+        if retryable:
+            attempt = message.get("attempt", 0) + 1
+            if self._retry and attempt <= self._retry_times:
+                message["attempt"] = attempt
+                delay = self._retry.backoff(attempt)
+                if self._retry.schedule(message, delay):
+                    logger.info(f"Gotify消息推送 {delay:.1f} 秒后进行第 {attempt} 次重试：{message.get('title')}")
+                    return
+            if self._outbox is not None:
+                self._outbox.append([message])
+                logger.warn(f"Gotify消息推送 重试耗尽，消息已存入发件箱：{message.get('title')}")
+        elif diverted and self._outbox is not None:
+            self._outbox.append([message])
+            logger.info(f"Gotify消息推送 服务器熔断中，消息已存入发件箱：{message.get('title')}")
 
+    def __post(self, message: dict, target: GotifyTarget) -> str:
+        """
+        推送消息到Gotify服务器，返回推送结果
+        """
+        title = message.get("title")
+        text = message.get("text")
         try:
             if not title or not text:
                 logger.warn("标题和内容不能为空")
-                return
-            if not self._server or not self._apikey or not self._priority:
-                logger.info("Gotify消息推送 参数未配置")
-                return False, "参数未配置"
-            sc_url = "%s/%s" % (self._server, 'message?token=' + self._apikey)
+                return self.DELIVER_INVALID
+            if not target.server or not target.token or not target.priority:
+                logger.info(f"Gotify消息推送 {target.name} 参数未配置")
+                return self.DELIVER_INVALID
+            sc_url = "%s/%s" % (target.server, 'message?token=' + target.token)
             data = {
                 "title": title,
                 "message": text,
-                "priority": self._priority
+                "priority": self.__to_int(target.priority, 0, minimum=0)
             }
-            res = RequestUtils().post_res(url = sc_url, data = data)
+            if message.get("extras"):
+                data["extras"] = message.get("extras")
+            started = time.perf_counter()
+            # RequestUtils 默认使用表单 Content-Type，且不会被 json 参数覆盖，需显式指定
+            res = RequestUtils(session=self.__get_session(target.server),
+                               content_type="application/json").post_res(url = sc_url, json = data)
+            if self._metrics:
+                self._metrics.observe(str(res.status_code) if res is not None else "error",
+                                      time.perf_counter() - started)
             if res or res is not None:
                 if res.status_code == 200:
-                    logger.info("Gotify消息发送成功")
+                    logger.info(f"Gotify消息发送成功：{target.name}")
+                    return self.DELIVER_OK
                 elif res.status_code == 400:
-                    logger.warn(f"Gotify消息发送失败,错误码:{res.status_code},错误原因:{res.reason}, 返回信息:{res}: 发送的消息格式错误或不兼容!")
+                    logger.warn(f"Gotify消息发送失败({target.name}),错误码:{res.status_code},错误原因:{res.reason}, 返回信息:{res}: 发送的消息格式错误或不兼容!")
                 elif res.status_code == 401:
-                    logger.warn(f"Gotify消息发送失败,错误码:{res.status_code},错误原因:{res.reason}, 返回信息:{res}: 未经授权的错误-令牌无效!")
+                    logger.warn(f"Gotify消息发送失败({target.name}),错误码:{res.status_code},错误原因:{res.reason}, 返回信息:{res}: 未经授权的错误-令牌无效!")
                 elif res.status_code == 403:
-                    logger.warn(f"Gotify消息发送失败,错误码:{res.status_code},错误原因:{res.reason}, 返回信息:{res}: 本插件端已被gotify服务器端禁止!")
+                    logger.warn(f"Gotify消息发送失败({target.name}),错误码:{res.status_code},错误原因:{res.reason}, 返回信息:{res}: 本插件端已被gotify服务器端禁止!")
                 elif res.status_code == 404:
-                    logger.warn(f"Gotify消息发送失败,错误码:{res.status_code},错误原因:{res.reason}, 返回信息:{res}: API URL未找到!")
+                    logger.warn(f"Gotify消息发送失败({target.name}),错误码:{res.status_code},错误原因:{res.reason}, 返回信息:{res}: API URL未找到!")
                 else:
-                    logger.warn(f"Gotify消息发送失败,错误码:{res.status_code},错误原因:{res.reason}, 返回信息:{res}: 发送的 消息标题:{title},消息内容:{text}")
+                    logger.warn(f"Gotify消息发送失败({target.name}),错误码:{res.status_code},错误原因:{res.reason}, 返回信息:{res}: 发送的 消息标题:{title},消息内容:{text}")
+                    # 服务端错误、限流、请求超时属于临时错误
+                    if res.status_code == 429:
+                        # 服务器限流，清空令牌桶后重试
+                        if self._queue:
+                            self._queue.limiter.penalize()
+                        return self.DELIVER_LIMITED
+                    if res.status_code >= 500 or res.status_code == 408:
+                        return self.DELIVER_RETRY
+                return self.DELIVER_FAIL
             else:
-                logger.warn(f"Gotify消息发送失败:未获取到返回信息!")
+                # 超时、连接被拒绝等网络错误
+                logger.warn(f"Gotify消息发送失败({target.name}):未获取到返回信息!")
+                return self.DELIVER_RETRY
         except Exception as msg_e:
-            logger.error(f"Gotify消息发送失败 错误:{(msg_e)},发送的 消息标题:{title},消息内容:{text}")
+            logger.error(f"Gotify消息发送失败({target.name}) 错误:{(msg_e)},发送的 消息标题:{title},消息内容:{text}")
+            return self.DELIVER_RETRY
+
+    def __get_session(self, server: str) -> Session:
+        """
+        获取指定服务器的长连接连接池会话，空闲超时后重建
+        """
+        with self._session_lock:
+            now = time.monotonic()
+            session = self._sessions.get(server)
+            if session and now - self._session_last_used.get(server, 0) > self._pool_idle_timeout:
+                # 空闲连接大概率已被服务端断开，直接重建
+                session.close()
+                session = None
+            if not session:
+                session = Session()
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self._pool_size)
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                self._sessions[server] = session
+            self._session_last_used[server] = now
+            return session
+
+    def __close_sessions(self, keep: Optional[set] = None):
+        """
+        关闭连接池会话，keep 中的服务器除外
+        """
+        if not self._sessions:
+            return
+        with self._session_lock:
+            for server in list(self._sessions.keys()):
+                if keep and server in keep:
+                    continue
+                self._sessions.pop(server).close()
+                self._session_last_used.pop(server, None)
+
+    def __stop_queue(self):
+        """
+        停止投递队列，尽量投递完剩余消息
+        """
+        if self._coalescer:
+            # 先输出合并窗口中的消息
+            self._coalescer.close()
+            self._coalescer = None
+        retry = self._retry
+        self._retry = None
+        if retry:
+            # 等待重试的消息直接存入发件箱，下次启动后补发
+            pending = retry.stop()
+            if pending and self._outbox is not None:
+                self._outbox.append(pending)
+        if self._queue:
+            self._queue.stop()
+            self._queue = None
 
     def stop_service(self):
         """
         退出插件
         """
-        pass
+        try:
+            self.__stop_queue()
+            self.__close_sessions()
+        except Exception as e:
+            logger.error("退出插件失败：%s" % str(e))